@@ -7,15 +7,23 @@ from blogus.web import app
 from blogus.core import (
     TargetLLMModel,
     JudgeLLMModel,
+    Fragment,
+    Log,
+    Test,
+    PromptAnalysis,
+    get_llm_response,
+    infer_goal,
+    analyze_fragments,
+    analyze_logs,
     analyze_prompt,
     generate_test,
     execute_prompt,
-    infer_goal,
 )
 
 __all__ = [
     "app",
-    "LLMModel",
+    "TargetLLMModel",
+    "JudgeLLMModel",
     "Fragment",
     "Log",
     "Test",
@@ -5,6 +5,6 @@ Backward compatibility entry point for Blogus.
 from blogus.web import app
 
 if __name__ == "__main__":
-    import uvicorn
+    from blogus.web_cli import main
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    main()
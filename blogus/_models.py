@@ -0,0 +1,32 @@
+"""
+Model enums for Blogus.
+
+Kept free of heavy imports so the CLI can build its options without loading LiteLLM.
+"""
+
+from enum import Enum
+
+
+# Define model enums for target models and judge models
+class TargetLLMModel(str, Enum):
+    CLAUDE_3_OPUS = "claude-3-opus-20240229"
+    CLAUDE_3_SONNET = "claude-3-sonnet-20240229"
+    CLAUDE_3_HAIKU = "claude-3-haiku-20240307"
+    GPT_4 = "gpt-4o"
+    GPT_4_TURBO = "gpt-4-turbo"
+    GPT_3_5_TURBO = "gpt-3.5-turbo"
+    GROQ_LLAMA3_70B = "groq/llama3-70b-8192"
+    GROQ_MIXTRAL_8X7B = "groq/mixtral-8x7b-32768"
+    GROQ_GEMMA_7B = "groq/gemma-7b-it"
+
+
+class JudgeLLMModel(str, Enum):
+    CLAUDE_3_OPUS = "claude-3-opus-20240229"
+    CLAUDE_3_SONNET = "claude-3-sonnet-20240229"
+    CLAUDE_3_HAIKU = "claude-3-haiku-20240307"
+    GPT_4 = "gpt-4o"
+    GPT_4_TURBO = "gpt-4-turbo"
+    GPT_3_5_TURBO = "gpt-3.5-turbo"
+    GROQ_LLAMA3_70B = "groq/llama3-70b-8192"
+    GROQ_MIXTRAL_8X7B = "groq/mixtral-8x7b-32768"
+    GROQ_GEMMA_7B = "groq/gemma-7b-it"
@@ -0,0 +1,221 @@
+"""
+Offline batch execution for Blogus.
+
+Generating many test cases one request at a time is slow and billed at the full
+per-request price. OpenAI's Batch API accepts a file of requests, processes them
+server-side (within 24 hours, usually much sooner) and bills them at half price.
+This module submits requests through LiteLLM's file and batch APIs and waits for
+the results.
+
+Only OpenAI models are supported, since LiteLLM's batch API targets OpenAI-style
+endpoints.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import litellm
+
+from blogus.core import (
+    Test,
+    _TEST_GENERATION_SYSTEM,
+    _TEST_SCHEMA,
+    _completion_options,
+    _ensure_env,
+    _json_loads,
+    _parse_test,
+    _test_generation_prompt,
+    infer_goal,
+)
+
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def _batch_request(
+    index: int,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    system: Optional[str],
+    json_mode: bool,
+    schema: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Build one line of the batch input file."""
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+
+    body = {"model": model, "messages": messages, "max_tokens": max_tokens}
+    if json_mode:
+        body["response_format"] = _completion_options(model, json_mode, schema)[
+            "response_format"
+        ]
+    return {
+        "custom_id": f"request-{index}",
+        "method": "POST",
+        "url": _BATCH_ENDPOINT,
+        "body": body,
+    }
+
+
+def _read_batch_file(file_id: Optional[str]) -> List[Dict[str, Any]]:
+    """Download a batch output or error file and parse its JSON lines."""
+    if not file_id:
+        return []
+    output = litellm.file_content(file_id=file_id, custom_llm_provider="openai")
+    return [
+        _json_loads(line)
+        for line in output.content.decode("utf-8").splitlines()
+        if line.strip()
+    ]
+
+
+def submit_batch(
+    prompts: List[str],
+    model: str,
+    max_tokens: int = 1000,
+    system: Optional[str] = None,
+    json_mode: bool = False,
+    schema: Optional[Dict[str, Any]] = None,
+    poll_interval: float = 30.0,
+    timeout: Optional[float] = None,
+) -> List[str]:
+    """Run prompts through the OpenAI Batch API and wait for the responses.
+
+    Args:
+        prompts (List[str]): The prompts to send
+        model (str): The OpenAI model to use (e.g., "gpt-4o")
+        max_tokens (int, optional): Maximum number of tokens to generate per prompt.
+            Defaults to 1000.
+        system (Optional[str], optional): System instructions sent with every prompt.
+            Defaults to None.
+        json_mode (bool, optional): Ask the model to return JSON objects.
+            Defaults to False.
+        schema (Optional[Dict[str, Any]], optional): JSON schema the responses must
+            follow when json_mode is set and the model supports it. Defaults to None.
+        poll_interval (float, optional): Seconds to wait between status checks.
+            Defaults to 30.
+        timeout (Optional[float], optional): Give up after this many seconds.
+            Defaults to None (wait until the batch finishes).
+
+    Returns:
+        List[str]: The responses, in the same order as the prompts
+
+    Raises:
+        ValueError: If the model is not an OpenAI model
+        RuntimeError: If the batch does not complete or a request in it fails
+        TimeoutError: If the batch is still running after timeout seconds
+    """
+    _ensure_env()
+    model = getattr(model, "value", model)
+    try:
+        model_name, provider, _, _ = litellm.get_llm_provider(model)
+    except litellm.BadRequestError:
+        provider = None
+    if provider != "openai":
+        raise ValueError(f"Batch execution is only supported for OpenAI models, not {model}")
+
+    lines = [
+        json.dumps(
+            _batch_request(i, model_name, prompt, max_tokens, system, json_mode, schema)
+        )
+        for i, prompt in enumerate(prompts)
+    ]
+    input_file = litellm.create_file(
+        file=("blogus_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+        custom_llm_provider="openai",
+    )
+    batch = litellm.create_batch(
+        completion_window="24h",
+        endpoint=_BATCH_ENDPOINT,
+        input_file_id=input_file.id,
+        custom_llm_provider="openai",
+    )
+
+    started = time.monotonic()
+    while batch.status not in _TERMINAL_STATUSES:
+        if timeout is not None and time.monotonic() - started > timeout:
+            raise TimeoutError(f"Batch {batch.id} did not finish within {timeout} seconds")
+        time.sleep(poll_interval)
+        batch = litellm.retrieve_batch(batch.id, custom_llm_provider="openai")
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    # Successful requests are written to the output file and failed ones to the
+    # error file; either may be missing if every request succeeded or failed
+    responses: Dict[str, str] = {}
+    errors: Dict[str, Any] = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        for result in _read_batch_file(file_id):
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                errors[result["custom_id"]] = result.get("error") or response.get("body")
+            else:
+                responses[result["custom_id"]] = response["body"]["choices"][0][
+                    "message"
+                ]["content"]
+
+    if errors:
+        failed = "; ".join(
+            f"{custom_id}: {error}" for custom_id, error in sorted(errors.items())
+        )
+        raise RuntimeError(f"Batch {batch.id} requests failed: {failed}")
+    missing = [
+        f"request-{i}" for i in range(len(prompts)) if f"request-{i}" not in responses
+    ]
+    if missing:
+        raise RuntimeError(
+            f"Batch {batch.id} returned no response for {', '.join(missing)}"
+        )
+
+    return [responses[f"request-{i}"] for i in range(len(prompts))]
+
+
+def generate_tests_batch(
+    prompt: str,
+    judge_model: str,
+    n: int,
+    goal: Optional[str] = None,
+    **kwargs: Any,
+) -> List[Test]:
+    """Generate several test cases for a prompt with one batch submission.
+
+    The goal is inferred once (if not provided) and the test-generation requests
+    are then submitted together via :func:`submit_batch`.
+
+    Args:
+        prompt (str): The prompt to generate test cases for
+        judge_model (str): The OpenAI judge model to use for generation
+        n (int): Number of test cases to generate
+        goal (Optional[str], optional): The goal of the prompt. If None, it will be inferred.
+        **kwargs: Extra arguments passed to :func:`submit_batch`, e.g. poll_interval
+
+    Returns:
+        List[Test]: The generated test cases
+
+    Raises:
+        ValueError: If a judge model response cannot be parsed as valid JSON
+    """
+    if goal is None:
+        goal = infer_goal(prompt, judge_model)
+
+    user_message = _test_generation_prompt(prompt, goal)
+    # Number each request so the judge produces distinct test cases
+    prompts = [
+        f"{user_message}\n\nThis is test case {i + 1} of {n}; make it different from the others."
+        for i in range(n)
+    ]
+    responses = submit_batch(
+        prompts,
+        judge_model,
+        system=_TEST_GENERATION_SYSTEM,
+        json_mode=True,
+        schema=_TEST_SCHEMA,
+        **kwargs,
+    )
+    return [_parse_test(response) for response in responses]
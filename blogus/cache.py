@@ -0,0 +1,219 @@
+"""
+Exact-match response cache for Blogus.
+
+LLM calls are network-bound and slow, and during prompt development the same
+request is often sent many times (the CLI, the web API and the analysis
+functions all re-run identical prompts). :class:`LLMCache` stores responses by a
+hash of the request so that repeated requests never reach the LLM.
+
+Responses are kept in memory by default. Set ``BLOGUS_CACHE_DIR`` to persist them
+to disk across processes, and ``BLOGUS_CACHE_TTL`` (in seconds) to expire old
+entries. Other storage (such as Redis) can be plugged in by implementing the
+:class:`CacheBackend` protocol.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Protocol, Tuple
+
+DEFAULT_MAXSIZE = 1024
+
+
+class CacheBackend(Protocol):
+    """Storage used by :class:`LLMCache`.
+
+    Entries are ``(created_at, value)`` tuples, where ``created_at`` is a
+    ``time.time()`` timestamp used for expiry.
+    """
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        """Return the entry stored under key, or None."""
+        ...
+
+    def set(self, key: str, entry: Tuple[float, str]) -> None:
+        """Store an entry under key."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under key, if any."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        ...
+
+
+class MemoryBackend:
+    """In-memory backend that evicts the least recently used entry when full.
+
+    Attributes:
+        maxsize (int): Maximum number of entries to keep
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileBackend:
+    """Backend that stores each entry as a JSON file in a directory.
+
+    Attributes:
+        directory (str): Directory holding the cache files
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            return data["created_at"], data["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, entry: Tuple[float, str]) -> None:
+        created_at, value = entry
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created_at": created_at, "value": value}, f)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                self.delete(name[: -len(".json")])
+
+
+class LLMCache:
+    """Cache of LLM responses keyed by a hash of the request.
+
+    Attributes:
+        backend (CacheBackend): Storage for the cached responses
+        ttl (Optional[float]): Seconds after which an entry expires, or None to never expire
+        hits (int): Number of lookups that returned a cached response
+        misses (int): Number of lookups that found nothing
+    """
+
+    def __init__(
+        self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = None
+    ):
+        """Create a response cache.
+
+        Args:
+            backend (Optional[CacheBackend], optional): Storage to use. Defaults to
+                an in-memory LRU backend.
+            ttl (Optional[float], optional): Seconds after which entries expire.
+                Defaults to None (never expire).
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        """Create a cache configured by ``BLOGUS_CACHE_DIR`` and ``BLOGUS_CACHE_TTL``.
+
+        Returns:
+            LLMCache: A file-backed cache if ``BLOGUS_CACHE_DIR`` is set, otherwise
+                an in-memory cache
+        """
+        cache_dir = os.getenv("BLOGUS_CACHE_DIR")
+        ttl = os.getenv("BLOGUS_CACHE_TTL")
+        backend = FileBackend(cache_dir) if cache_dir else MemoryBackend()
+        return cls(backend, float(ttl) if ttl else None)
+
+    @staticmethod
+    def make_key(**fields: Any) -> str:
+        """Build a cache key from the fields that identify a request.
+
+        Args:
+            **fields: JSON-serializable request fields, e.g. model, prompt and max_tokens
+
+        Returns:
+            str: A sha256 hex digest of the fields
+        """
+        payload = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or expired entry.
+
+        Args:
+            key (str): Key built with :meth:`make_key`
+
+        Returns:
+            Optional[str]: The cached response
+        """
+        entry = self.backend.get(key)
+        if entry is not None and self.ttl is not None:
+            if time.time() - entry[0] > self.ttl:
+                self.backend.delete(key)
+                entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response.
+
+        Args:
+            key (str): Key built with :meth:`make_key`
+            value (str): The response to cache
+        """
+        self.backend.set(key, (time.time(), value))
+
+    def delete(self, key: str) -> None:
+        """Remove a response, e.g. one that turned out to be invalid.
+
+        Args:
+            key (str): Key built with :meth:`make_key`
+        """
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset the hit and miss counters."""
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
@@ -3,16 +3,14 @@ Command-line interface for Blogus.
 """
 
 import click
-from blogus.core import (
-    TargetLLMModel,
-    JudgeLLMModel,
-    analyze_prompt,
-    analyze_fragments,
-    analyze_logs,
-    generate_test,
-    execute_prompt,
-    infer_goal,
-)
+
+# Only the lightweight model enums are imported here; blogus.core pulls in LiteLLM,
+# so each command imports what it needs when it runs.
+from blogus._models import TargetLLMModel, JudgeLLMModel
+
+# Model names accepted by --target-model and --judge-model, shared by every command
+_TARGET_CHOICES = tuple(m.value for m in TargetLLMModel)
+_JUDGE_CHOICES = tuple(m.value for m in JudgeLLMModel)
 
 
 @click.group()
@@ -25,13 +23,13 @@ def cli():
 @click.argument("prompt", type=str)
 @click.option(
     "--target-model",
-    type=click.Choice([m.value for m in TargetLLMModel]),
+    type=click.Choice(_TARGET_CHOICES),
     default=TargetLLMModel.GPT_4,
     help="Target LLM model to use for prompt execution",
 )
 @click.option(
     "--judge-model",
-    type=click.Choice([m.value for m in JudgeLLMModel]),
+    type=click.Choice(_JUDGE_CHOICES),
     default=JudgeLLMModel.GPT_4,
     help="Judge LLM model to use for analysis",
 )
@@ -43,11 +41,17 @@ def cli():
 )
 def analyze(prompt, target_model, judge_model, goal):
     """Analyze a prompt for effectiveness and alignment with a goal."""
+    from blogus.core import analyze_prompt
+
     click.echo(f"Analyzing prompt with judge model {judge_model}...")
 
     # Perform analysis
     analysis = analyze_prompt(prompt, judge_model, goal)
+    _echo_analysis(analysis)
+
 
+def _echo_analysis(analysis):
+    """Print prompt analysis results."""
     click.echo("\nPrompt Analysis Results:")
     click.echo("=" * 50)
     click.echo(f"Overall Goal Alignment: {analysis.overall_goal_alignment}/10")
@@ -65,13 +69,13 @@ def analyze(prompt, target_model, judge_model, goal):
 @click.argument("prompt", type=str)
 @click.option(
     "--target-model",
-    type=click.Choice([m.value for m in TargetLLMModel]),
+    type=click.Choice(_TARGET_CHOICES),
     default=TargetLLMModel.GPT_4,
     help="Target LLM model to use for prompt execution",
 )
 @click.option(
     "--judge-model",
-    type=click.Choice([m.value for m in JudgeLLMModel]),
+    type=click.Choice(_JUDGE_CHOICES),
     default=JudgeLLMModel.GPT_4,
     help="Judge LLM model to use for analysis",
 )
@@ -83,11 +87,17 @@ def analyze(prompt, target_model, judge_model, goal):
 )
 def fragments(prompt, target_model, judge_model, goal):
     """Analyze prompt fragments for goal alignment."""
+    from blogus.core import analyze_fragments
+
     click.echo(f"Analyzing prompt fragments with judge model {judge_model}...")
 
     # Analyze fragments
     fragments = analyze_fragments(prompt, judge_model, goal)
+    _echo_fragments(fragments)
 
+
+def _echo_fragments(fragments):
+    """Print fragment analysis results."""
     click.echo("\nFragment Analysis Results:")
     click.echo("=" * 50)
     for i, fragment in enumerate(fragments, 1):
@@ -102,13 +112,13 @@ def fragments(prompt, target_model, judge_model, goal):
 @click.argument("prompt", type=str)
 @click.option(
     "--target-model",
-    type=click.Choice([m.value for m in TargetLLMModel]),
+    type=click.Choice(_TARGET_CHOICES),
     default=TargetLLMModel.GPT_4,
     help="Target LLM model to use for prompt execution",
 )
 @click.option(
     "--judge-model",
-    type=click.Choice([m.value for m in JudgeLLMModel]),
+    type=click.Choice(_JUDGE_CHOICES),
     default=JudgeLLMModel.GPT_4,
     help="Judge LLM model to use for analysis",
 )
@@ -120,11 +130,17 @@ def fragments(prompt, target_model, judge_model, goal):
 )
 def logs(prompt, target_model, judge_model, goal):
     """Generate logs for a prompt."""
+    from blogus.core import analyze_logs
+
     click.echo(f"Generating logs with judge model {judge_model}...")
 
     # Generate logs
     logs = analyze_logs(prompt, judge_model, goal)
+    _echo_logs(logs)
+
 
+def _echo_logs(logs):
+    """Print prompt logs."""
     click.echo("\nPrompt Logs:")
     click.echo("=" * 50)
     for log in logs:
@@ -135,13 +151,13 @@ def logs(prompt, target_model, judge_model, goal):
 @click.argument("prompt", type=str)
 @click.option(
     "--target-model",
-    type=click.Choice([m.value for m in TargetLLMModel]),
+    type=click.Choice(_TARGET_CHOICES),
     default=TargetLLMModel.GPT_4,
     help="Target LLM model to use for prompt execution",
 )
 @click.option(
     "--judge-model",
-    type=click.Choice([m.value for m in JudgeLLMModel]),
+    type=click.Choice(_JUDGE_CHOICES),
     default=JudgeLLMModel.GPT_4,
     help="Judge LLM model to use for analysis",
 )
@@ -151,13 +167,34 @@ def logs(prompt, target_model, judge_model, goal):
     default=None,
     help="Goal for the prompt (will be inferred if not provided)",
 )
-def test(prompt, target_model, judge_model, goal):
+@click.option(
+    "--batch",
+    type=int,
+    default=None,
+    metavar="N",
+    help="Generate N test cases via the OpenAI Batch API (slower, half the cost)",
+)
+def test(prompt, target_model, judge_model, goal, batch):
     """Generate a test case for a prompt."""
+    if batch:
+        from blogus.batch import generate_tests_batch
+
+        click.echo(f"Submitting {batch} test cases to the batch API for {judge_model}...")
+        for test_case in generate_tests_batch(prompt, judge_model, batch, goal):
+            _echo_test(test_case)
+        return
+
+    from blogus.core import generate_test
+
     click.echo(f"Generating test case with judge model {judge_model}...")
 
     # Generate test
-    test_case = generate_test(prompt, judge_model, goal)
+    test_case = generate_test(prompt, judge_model, goal, target_model)
+    _echo_test(test_case)
+
 
+def _echo_test(test_case):
+    """Print a generated test case."""
     click.echo("\nGenerated Test Case:")
     click.echo("=" * 50)
     click.echo("Input:")
@@ -167,36 +204,89 @@ def test(prompt, target_model, judge_model, goal):
     click.echo(f"Goal Relevance: {test_case.goal_relevance}/5")
 
 
+@cli.command(name="all")
+@click.argument("prompt", type=str)
+@click.option(
+    "--judge-model",
+    type=click.Choice(_JUDGE_CHOICES),
+    default=JudgeLLMModel.GPT_4,
+    help="Judge LLM model to use for analysis",
+)
+@click.option(
+    "--goal",
+    type=str,
+    default=None,
+    help="Goal for the prompt (will be inferred if not provided)",
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    default=False,
+    help="Send the analysis requests as one LiteLLM batch instead of with asyncio",
+)
+@click.option(
+    "--combined",
+    is_flag=True,
+    default=False,
+    help="Ask the judge model for every analysis in a single call",
+)
+def all_(prompt, judge_model, goal, batch, combined):
+    """Run every analysis of a prompt concurrently."""
+    import asyncio
+    from blogus.core import analyze_all, analyze_combined, full_analysis
+
+    click.echo(f"Running full analysis with judge model {judge_model}...")
+
+    if combined:
+        result = analyze_combined(prompt, judge_model, goal)
+    elif batch:
+        result = analyze_all(prompt, judge_model, goal)
+    else:
+        # Run the analyses concurrently
+        result = asyncio.run(full_analysis(prompt, judge_model, goal))
+
+    click.echo(f"\nGoal: {result.goal}")
+    _echo_analysis(result.analysis)
+    _echo_fragments(result.fragments)
+    _echo_logs(result.logs)
+    _echo_test(result.test)
+
+
 @cli.command()
 @click.argument("prompt", type=str)
 @click.option(
     "--target-model",
-    type=click.Choice([m.value for m in TargetLLMModel]),
+    type=click.Choice(_TARGET_CHOICES),
     default=TargetLLMModel.GPT_4,
     help="Target LLM model to use for prompt execution",
 )
 def execute(prompt, target_model):
     """Execute a prompt with the specified target LLM."""
-    click.echo(f"Executing prompt with target model {target_model}...")
+    from blogus.core import execute_prompt_stream
 
-    # Execute prompt
-    result = execute_prompt(prompt, target_model)
+    click.echo(f"Executing prompt with target model {target_model}...")
 
     click.echo("\nExecution Result:")
     click.echo("=" * 50)
-    click.echo(result)
+
+    # Execute prompt, printing the response as it is generated
+    for text in execute_prompt_stream(prompt, target_model):
+        click.echo(text, nl=False)
+    click.echo()
 
 
 @cli.command()
 @click.argument("prompt", type=str)
 @click.option(
     "--judge-model",
-    type=click.Choice([m.value for m in JudgeLLMModel]),
+    type=click.Choice(_JUDGE_CHOICES),
     default=JudgeLLMModel.GPT_4,
     help="Judge LLM model to use for analysis",
 )
 def goal(prompt, judge_model):
     """Infer the goal of a prompt."""
+    from blogus.core import infer_goal
+
     click.echo(f"Inferring goal with judge model {judge_model}...")
 
     # Infer goal
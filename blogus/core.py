@@ -23,39 +23,32 @@ Key Features:
 """
 
 import os
+import asyncio
+import atexit
 import json
 import re
-from typing import List, Optional, Dict, Any
-from enum import Enum
+import time
+import hashlib
+import functools
+from typing import List, Optional, Dict, Any, AsyncIterator, Iterator, Union
 from dotenv import load_dotenv
-from litellm import completion
-
-# Load environment variables
-load_dotenv()
-
-# Define model enums for target models and judge models
-class TargetLLMModel(str, Enum):
-    CLAUDE_3_OPUS = "claude-3-opus-20240229"
-    CLAUDE_3_SONNET = "claude-3-sonnet-20240229"
-    CLAUDE_3_HAIKU = "claude-3-haiku-20240307"
-    GPT_4 = "gpt-4o"
-    GPT_4_TURBO = "gpt-4-turbo"
-    GPT_3_5_TURBO = "gpt-3.5-turbo"
-    GROQ_LLAMA3_70B = "groq/llama3-70b-8192"
-    GROQ_MIXTRAL_8X7B = "groq/mixtral-8x7b-32768"
-    GROQ_GEMMA_7B = "groq/gemma-7b-it"
-
-
-class JudgeLLMModel(str, Enum):
-    CLAUDE_3_OPUS = "claude-3-opus-20240229"
-    CLAUDE_3_SONNET = "claude-3-sonnet-20240229"
-    CLAUDE_3_HAIKU = "claude-3-haiku-20240307"
-    GPT_4 = "gpt-4o"
-    GPT_4_TURBO = "gpt-4-turbo"
-    GPT_3_5_TURBO = "gpt-3.5-turbo"
-    GROQ_LLAMA3_70B = "groq/llama3-70b-8192"
-    GROQ_MIXTRAL_8X7B = "groq/mixtral-8x7b-32768"
-    GROQ_GEMMA_7B = "groq/gemma-7b-it"
+
+from blogus._models import TargetLLMModel, JudgeLLMModel
+from blogus.cache import LLMCache
+from blogus.semantic_cache import DEFAULT_THRESHOLD, SemanticCache
+
+# Judge-model responses are parsed with orjson when it is installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+# Template variables in a prompt, e.g. {text}
+_VAR_RE = re.compile(r"\{([^}]+)\}")
 
 
 class Fragment:
@@ -70,6 +63,8 @@ class Fragment:
         goal_alignment (int): Alignment score with the goal (1-5 scale)
         improvement_suggestion (str): Suggested improvements for better goal alignment
     """
+    __slots__ = ("text", "type", "goal_alignment", "improvement_suggestion")
+
     def __init__(
         self, text: str, type: str, goal_alignment: int, improvement_suggestion: str
     ):
@@ -88,6 +83,8 @@ class Log:
         type (str): The type of log (info, warning, or error)
         message (str): The log message content
     """
+    __slots__ = ("type", "message")
+
     def __init__(self, type: str, message: str):
         self.type = type
         self.message = message
@@ -104,6 +101,8 @@ class Test:
         expected_output (str): The expected output for the given input
         goal_relevance (int): Relevance of the test to achieving the prompt's goal (1-5 scale)
     """
+    __slots__ = ("input", "expected_output", "goal_relevance")
+
     def __init__(
         self, input: Dict[str, str], expected_output: str, goal_relevance: int
     ):
@@ -125,6 +124,14 @@ class PromptAnalysis:
         inferred_goal (Optional[str]): The inferred goal if not explicitly provided
         is_goal_inferred (bool): Whether the goal was inferred or explicitly provided
     """
+    __slots__ = (
+        "overall_goal_alignment",
+        "suggested_improvements",
+        "estimated_effectiveness",
+        "inferred_goal",
+        "is_goal_inferred",
+    )
+
     def __init__(
         self,
         overall_goal_alignment: int,
@@ -140,7 +147,396 @@ class PromptAnalysis:
         self.is_goal_inferred = is_goal_inferred
 
 
-def get_llm_response(model: str, prompt: str, max_tokens: int = 1000) -> str:
+class FullAnalysis:
+    """Represents the combined results of every analysis of a prompt.
+    
+    A full analysis infers (or reuses) the prompt's goal once and then runs the
+    fragment, log, overall and test-generation analyses against that goal.
+    
+    Attributes:
+        goal (str): The goal the analyses were run against
+        is_goal_inferred (bool): Whether the goal was inferred or explicitly provided
+        fragments (List[Fragment]): Fragment analysis results
+        logs (List[Log]): Log messages for the prompt
+        analysis (PromptAnalysis): Overall prompt analysis
+        test (Test): A generated test case
+    """
+    __slots__ = ("goal", "is_goal_inferred", "fragments", "logs", "analysis", "test")
+
+    def __init__(
+        self,
+        goal: str,
+        is_goal_inferred: bool,
+        fragments: List[Fragment],
+        logs: List[Log],
+        analysis: PromptAnalysis,
+        test: Test,
+    ):
+        self.goal = goal
+        self.is_goal_inferred = is_goal_inferred
+        self.fragments = fragments
+        self.logs = logs
+        self.analysis = analysis
+        self.test = test
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_env() -> bool:
+    """Load environment variables (such as provider API keys) from .env once.
+    
+    This runs on the first LLM call rather than at import time, so importing
+    blogus.core does not touch the filesystem.
+    """
+    load_dotenv()
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def _get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the semantic cache if enabled via BLOGUS_SEMANTIC_CACHE, else None."""
+    _ensure_env()
+    if os.getenv("BLOGUS_SEMANTIC_CACHE", "").lower() not in ("1", "true", "yes"):
+        return None
+    threshold = float(
+        os.getenv("BLOGUS_SEMANTIC_CACHE_THRESHOLD", str(DEFAULT_THRESHOLD))
+    )
+    semantic_cache = SemanticCache(
+        threshold=threshold, path=os.getenv("BLOGUS_SEMANTIC_CACHE_PATH")
+    )
+    if semantic_cache.path:
+        atexit.register(semantic_cache.save)
+    return semantic_cache
+
+
+@functools.lru_cache(maxsize=1)
+def get_response_cache() -> LLMCache:
+    """Return the exact-match cache shared by all LLM calls.
+    
+    The cache is configured from the environment on first use: set BLOGUS_CACHE_DIR
+    to persist responses to disk and BLOGUS_CACHE_TTL to expire them after a number
+    of seconds. Its ``hits`` and ``misses`` counters show how effective it is.
+    
+    Returns:
+        LLMCache: The response cache
+    """
+    _ensure_env()
+    return LLMCache.from_env()
+
+
+def _clear_response_caches() -> None:
+    """Empty the exact-match and semantic response caches."""
+    get_response_cache().clear()
+    semantic_cache = _get_semantic_cache()
+    if semantic_cache is not None:
+        semantic_cache.clear()
+
+
+def _cache_namespace(
+    model: str, max_tokens: int, json_mode: bool, system: Optional[str]
+) -> tuple:
+    """Return the request options a cached response is only valid for."""
+    model_name = getattr(model, "value", model)
+    system_hash = hashlib.sha256(system.encode("utf-8")).hexdigest() if system else None
+    return (model_name, max_tokens, json_mode, system_hash)
+
+
+def _cache_lookup(
+    model: str, prompt: str, max_tokens: int, json_mode: bool, system: Optional[str] = None
+) -> Optional[str]:
+    """Return a cached response for the request, or None on a miss."""
+    namespace = _cache_namespace(model, max_tokens, json_mode, system)
+    cached = get_response_cache().get(LLMCache.make_key(request=namespace, prompt=prompt))
+    if cached is not None:
+        return cached
+
+    semantic_cache = _get_semantic_cache()
+    if semantic_cache is not None:
+        return semantic_cache.get(namespace, prompt)
+    return None
+
+
+def _cache_store(
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+    content: str,
+    system: Optional[str] = None,
+) -> None:
+    """Store a response in the exact-match and semantic caches."""
+    namespace = _cache_namespace(model, max_tokens, json_mode, system)
+    get_response_cache().set(LLMCache.make_key(request=namespace, prompt=prompt), content)
+
+    semantic_cache = _get_semantic_cache()
+    if semantic_cache is not None:
+        semantic_cache.add(namespace, prompt, content)
+
+
+def _cache_evict(
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+    content: str,
+    system: Optional[str] = None,
+) -> None:
+    """Remove a response from the exact-match and semantic caches."""
+    namespace = _cache_namespace(model, max_tokens, json_mode, system)
+    get_response_cache().delete(LLMCache.make_key(request=namespace, prompt=prompt))
+
+    semantic_cache = _get_semantic_cache()
+    if semantic_cache is not None:
+        semantic_cache.discard(namespace, content)
+
+
+def _parse_judge_response(
+    parser: Any,
+    response: str,
+    model: str,
+    prompt: str,
+    system: str,
+    *args: Any,
+    max_tokens: int = 1000,
+) -> Any:
+    """Parse a judge model response, dropping it from the caches if it is invalid.
+    
+    Without this a malformed or truncated response would be served from the cache on
+    every retry, and the same error raised, instead of asking the model again.
+    """
+    try:
+        return parser(response, *args)
+    except ValueError:
+        _cache_evict(model, prompt, max_tokens, True, response, system)
+        raise
+
+
+def _http_client_options() -> Dict[str, Any]:
+    """Build the connection pool settings shared by the sync and async HTTP clients.
+    
+    Keep-alive connections are reused across requests, so long-running processes
+    (such as the web app) only pay for DNS and the TLS handshake once per provider.
+    HTTP/2 is used when the optional ``h2`` package is installed.
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+
+        http2 = True
+    except ImportError:
+        http2 = False
+    return {
+        "http2": http2,
+        "timeout": 60.0,
+        "limits": httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _litellm() -> Any:
+    """Import and configure LiteLLM on first use.
+    
+    LiteLLM and the provider SDKs it pulls in take a noticeable time to import, so
+    they are only loaded once an LLM call is actually made.
+    """
+    import httpx
+    import litellm
+
+    # Reuse one HTTP connection pool for every LLM call unless the caller configured their own
+    if litellm.client_session is None:
+        litellm.client_session = httpx.Client(**_http_client_options())
+        atexit.register(litellm.client_session.close)
+    return litellm
+
+
+# Event loop the shared async HTTP client was created on. Connections cannot be
+# reused across event loops, so each new loop (e.g. each asyncio.run) gets its own client.
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def _ensure_async_client(litellm: Any) -> None:
+    """Give LiteLLM a pooled async HTTP client for the running event loop.
+    
+    The client created for a previous event loop is closed, so that its connection
+    pool is not leaked by each ``asyncio.run``.
+    """
+    global _async_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _async_client_loop is loop:
+        return
+    if litellm.aclient_session is None or _async_client_loop is not None:
+        import httpx
+
+        previous = litellm.aclient_session
+        # Replace the client before closing the old one, so that concurrent calls
+        # waiting on the close already see the new client
+        litellm.aclient_session = httpx.AsyncClient(**_http_client_options())
+        _async_client_loop = loop
+        if previous is not None:
+            await previous.aclose()
+
+
+async def aclose_http_client() -> None:
+    """Close the pooled async HTTP client created for the running event loop.
+    
+    Long-running servers should call this on shutdown so open keep-alive connections
+    are closed cleanly. A new client is created if an LLM call is made afterwards.
+    """
+    global _async_client_loop
+
+    if _async_client_loop is not asyncio.get_running_loop():
+        return
+    litellm = _litellm()
+    await litellm.aclient_session.aclose()
+    litellm.aclient_session = None
+    _async_client_loop = None
+
+
+# In-flight async requests, keyed by event loop and cache key, so that concurrent
+# identical requests share one model call.
+_inflight_requests: Dict[tuple, "asyncio.Task[str]"] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _retry_options() -> Dict[str, Any]:
+    """Build LiteLLM's retry arguments from BLOGUS_NUM_RETRIES (defaults to 3).
+    
+    Transient provider errors (rate limits, timeouts, 5xx responses, connection
+    errors) are retried with exponential backoff, so one failure does not throw away
+    a whole analysis. Errors that would fail again (authentication, bad requests such
+    as an exceeded context window, content policy violations, unknown models) are
+    raised straight away.
+    """
+    _ensure_env()
+    num_retries = int(os.getenv("BLOGUS_NUM_RETRIES", "3"))
+    if num_retries <= 0:
+        return {}
+    retry_policy = {
+        "AuthenticationErrorRetries": 0,
+        "BadRequestErrorRetries": 0,
+        "ContentPolicyViolationErrorRetries": 0,
+        "NotFoundErrorRetries": 0,
+        "DefaultRetries": num_retries,
+    }
+    return {
+        "num_retries": num_retries,
+        "retry_policy": retry_policy,
+        "retry_strategy": "exponential_backoff_retry",
+    }
+
+
+def completion(**kwargs: Any) -> Any:
+    """Call LiteLLM's ``completion``, importing LiteLLM on first use."""
+    return _litellm().completion(**_retry_options(), **kwargs)
+
+
+def batch_completion(**kwargs: Any) -> Any:
+    """Call LiteLLM's ``batch_completion``, importing LiteLLM on first use."""
+    return _litellm().batch_completion(**_retry_options(), **kwargs)
+
+
+class _RateLimiter:
+    """Space out requests so that at most ``rate`` start per second."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_start = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until the next request may start."""
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        # Reserve the slot before sleeping so concurrent callers queue up behind it
+        self._next_start = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+@functools.lru_cache(maxsize=1)
+def _rate_limit() -> Optional[float]:
+    """Read the per-model request rate limit from BLOGUS_RATE_LIMIT (requests per second)."""
+    _ensure_env()
+    rate = float(os.getenv("BLOGUS_RATE_LIMIT", "0"))
+    return rate if rate > 0 else None
+
+
+# Async request rate limiters, one per model
+_rate_limiters: Dict[str, _RateLimiter] = {}
+
+
+async def acompletion(**kwargs: Any) -> Any:
+    """Call LiteLLM's ``acompletion``, importing LiteLLM on first use.
+    
+    When ``BLOGUS_RATE_LIMIT`` is set, requests to each model are spaced out so that
+    concurrent analyses stay within the provider's rate limits.
+    """
+    litellm = _litellm()
+    await _ensure_async_client(litellm)
+    rate = _rate_limit()
+    if rate is not None:
+        model = getattr(kwargs.get("model"), "value", kwargs.get("model"))
+        limiter = _rate_limiters.get(model)
+        if limiter is None:
+            limiter = _rate_limiters[model] = _RateLimiter(rate)
+        await limiter.acquire()
+    return await litellm.acompletion(**_retry_options(), **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _supports_response_schema(model_name: str) -> bool:
+    """Return whether LiteLLM knows the model to support JSON schema responses."""
+    return _litellm().supports_response_schema(model=model_name)
+
+
+def _completion_options(
+    model: str, json_mode: bool, schema: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build the extra LiteLLM completion arguments for a request."""
+    if not json_mode:
+        return {}
+    # Constrain the response to the expected schema where the model supports it, so it
+    # cannot emit anything but the analysis; otherwise ask for any JSON object.
+    # Providers that do not support response_format drop it and rely on the prompt's
+    # instructions.
+    if schema is not None and _supports_response_schema(getattr(model, "value", model)):
+        response_format = {"type": "json_schema", "json_schema": schema}
+    else:
+        response_format = {"type": "json_object"}
+    return {"response_format": response_format, "drop_params": True}
+
+
+def _build_messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Build the chat messages for a request.
+    
+    The system message holds static instructions that are identical across calls,
+    so it is placed first and marked with ``cache_control`` to let providers that
+    support prompt caching (e.g. Anthropic) reuse the processed prefix. LiteLLM
+    drops the marker for providers that cache prefixes automatically (e.g. OpenAI).
+    """
+    messages: List[Dict[str, Any]] = []
+    if system:
+        messages.append(
+            {
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ],
+            }
+        )
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def get_llm_response(
+    model: str,
+    prompt: str,
+    max_tokens: int = 1000,
+    no_cache: bool = False,
+    json_mode: bool = False,
+    system: Optional[str] = None,
+    schema: Optional[Dict[str, Any]] = None,
+) -> str:
     """Get a response from the specified LLM using LiteLLM.
     
     This is the core function that interfaces with LLMs through LiteLLM's unified API.
@@ -150,6 +546,15 @@ def get_llm_response(model: str, prompt: str, max_tokens: int = 1000) -> str:
         model (str): The LLM model to use (e.g., "gpt-4o", "claude-3-opus-20240229")
         prompt (str): The prompt to send to the model
         max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 1000.
+        no_cache (bool, optional): Bypass the response cache: always call the model
+            and do not store the response. Defaults to False.
+        json_mode (bool, optional): Ask the provider to return a JSON object
+            (``response_format={"type": "json_object"}``). Defaults to False.
+        system (Optional[str], optional): Static instructions sent as a cacheable
+            system message ahead of the prompt. Defaults to None.
+        schema (Optional[Dict[str, Any]], optional): JSON schema (``{"name": ...,
+            "schema": {...}}``) the response must follow when json_mode is set and the
+            model supports structured outputs. Defaults to None.
         
     Returns:
         str: The response from the LLM as a string
@@ -158,15 +563,692 @@ def get_llm_response(model: str, prompt: str, max_tokens: int = 1000) -> str:
         >>> response = get_llm_response("gpt-4o", "Explain quantum computing in simple terms")
         >>> print(response)
         'Quantum computing is a type of computing that uses quantum bits...'
+    
+    Note:
+        Responses are cached by model, prompt and request options (see
+        :func:`get_response_cache`), so repeated identical requests (such as inferring
+        the goal of the same prompt from several analysis functions) only reach the LLM
+        once. When BLOGUS_SEMANTIC_CACHE is set,
+        prompts that are semantically equivalent to a cached one also reuse its response
+        (see :mod:`blogus.semantic_cache`). Use ``get_llm_response.cache_clear()`` to
+        empty the caches.
     """
+    _ensure_env()
+    if not no_cache:
+        cached = _cache_lookup(model, prompt, max_tokens, json_mode, system)
+        if cached is not None:
+            return cached
+
     response = completion(
         model=model,
-        messages=[{"role": "user", "content": prompt}],
+        messages=_build_messages(prompt, system),
+        max_tokens=max_tokens,
+        **_completion_options(model, json_mode, schema),
+    )
+    content = response.choices[0].message.content
+    if not no_cache:
+        _cache_store(model, prompt, max_tokens, json_mode, content, system)
+    return content
+
+
+get_llm_response.cache_clear = _clear_response_caches
+
+
+def get_llm_responses(
+    model: str,
+    prompts: List[str],
+    max_tokens: int = 1000,
+    no_cache: Union[bool, List[bool]] = False,
+    json_mode: bool = False,
+    systems: Optional[List[Optional[str]]] = None,
+) -> List[str]:
+    """Get responses for several prompts from the same LLM in one batch.
+    
+    Prompts that are not already cached are dispatched together with LiteLLM's
+    ``batch_completion``, which sends the requests concurrently.
+    
+    Args:
+        model (str): The LLM model to use (e.g., "gpt-4o", "claude-3-opus-20240229")
+        prompts (List[str]): The prompts to send to the model
+        max_tokens (int, optional): Maximum number of tokens to generate per prompt.
+            Defaults to 1000.
+        no_cache (Union[bool, List[bool]], optional): Bypass the response cache:
+            always call the model and do not store the response. Either one flag for
+            every prompt or a list with a flag for each prompt. Defaults to False.
+        json_mode (bool, optional): Ask the provider to return JSON objects.
+            Defaults to False.
+        systems (Optional[List[Optional[str]]], optional): Cacheable system
+            instructions for each prompt, in the same order. Defaults to None.
+        
+    Returns:
+        List[str]: The responses, in the same order as the prompts
+        
+    Raises:
+        Exception: The first error raised by any of the underlying LLM calls
+    """
+    _ensure_env()
+    if systems is None:
+        systems = [None] * len(prompts)
+    if isinstance(no_cache, bool):
+        no_cache = [no_cache] * len(prompts)
+    responses: List[Optional[str]] = [
+        None if skip else _cache_lookup(model, prompt, max_tokens, json_mode, system)
+        for prompt, system, skip in zip(prompts, systems, no_cache)
+    ]
+    missing = [i for i, response in enumerate(responses) if response is None]
+    if missing:
+        results = batch_completion(
+            model=model,
+            messages=[_build_messages(prompts[i], systems[i]) for i in missing],
+            max_tokens=max_tokens,
+            **_completion_options(model, json_mode),
+        )
+        for i, result in zip(missing, results):
+            if isinstance(result, Exception):
+                raise result
+            responses[i] = result.choices[0].message.content
+            if not no_cache[i]:
+                _cache_store(
+                    model, prompts[i], max_tokens, json_mode, responses[i], systems[i]
+                )
+    return responses
+
+
+async def aget_llm_response(
+    model: str,
+    prompt: str,
+    max_tokens: int = 1000,
+    no_cache: bool = False,
+    json_mode: bool = False,
+    system: Optional[str] = None,
+    schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Async version of :func:`get_llm_response` using LiteLLM's ``acompletion``.
+    
+    Shares the response cache with :func:`get_llm_response`. Concurrent identical
+    requests (e.g. several endpoints inferring the goal of the same prompt) are
+    coalesced into a single model call.
+    
+    Args:
+        model (str): The LLM model to use (e.g., "gpt-4o", "claude-3-opus-20240229")
+        prompt (str): The prompt to send to the model
+        max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 1000.
+        no_cache (bool, optional): Bypass the response cache: always call the model
+            and do not store the response. Defaults to False.
+        json_mode (bool, optional): Ask the provider to return a JSON object.
+            Defaults to False.
+        system (Optional[str], optional): Static instructions sent as a cacheable
+            system message ahead of the prompt. Defaults to None.
+        schema (Optional[Dict[str, Any]], optional): JSON schema (``{"name": ...,
+            "schema": {...}}``) the response must follow when json_mode is set and the
+            model supports structured outputs. Defaults to None.
+    
+    Returns:
+        str: The response from the LLM as a string
+    """
+    _ensure_env()
+    if no_cache:
+        return await _arequest_llm_response(
+            model, prompt, max_tokens, json_mode, system, schema
+        )
+
+    cached = _cache_lookup(model, prompt, max_tokens, json_mode, system)
+    if cached is not None:
+        return cached
+
+    # Identical requests made while one is already in flight wait for its response
+    # instead of calling the model again
+    loop = asyncio.get_running_loop()
+    key = (
+        loop,
+        LLMCache.make_key(
+            request=_cache_namespace(model, max_tokens, json_mode, system), prompt=prompt
+        ),
+    )
+    task = _inflight_requests.get(key)
+    if task is None:
+        # The shared call runs as its own task, so cancelling the request that
+        # started it does not cancel the others waiting for its response
+        task = loop.create_task(
+            _astore_llm_response(model, prompt, max_tokens, json_mode, system, schema)
+        )
+        _inflight_requests[key] = task
+        task.add_done_callback(functools.partial(_finish_inflight_request, key))
+    return await asyncio.shield(task)
+
+
+def _finish_inflight_request(key: tuple, task: "asyncio.Task[str]") -> None:
+    """Forget a finished in-flight request."""
+    del _inflight_requests[key]
+    if not task.cancelled():
+        # Mark the exception as retrieved in case every request stopped waiting
+        task.exception()
+
+
+async def _astore_llm_response(
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+    system: Optional[str],
+    schema: Optional[Dict[str, Any]],
+) -> str:
+    """Call the model with acompletion and store the response in the cache."""
+    content = await _arequest_llm_response(
+        model, prompt, max_tokens, json_mode, system, schema
+    )
+    _cache_store(model, prompt, max_tokens, json_mode, content, system)
+    return content
+
+
+async def _arequest_llm_response(
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+    system: Optional[str],
+    schema: Optional[Dict[str, Any]],
+) -> str:
+    """Call the model with acompletion, bypassing the response cache."""
+    response = await acompletion(
+        model=model,
+        messages=_build_messages(prompt, system),
         max_tokens=max_tokens,
+        **_completion_options(model, json_mode, schema),
     )
     return response.choices[0].message.content
 
 
+# Judge-model instructions. These are sent as a static system message ahead of the
+# prompt-specific user message so providers can cache them as a shared prefix.
+_GOAL_INFERENCE_SYSTEM = """Given a prompt for an LLM, infer the likely goal or intention of the user.
+
+Provide a concise statement of the inferred goal in one sentence as a JSON dictionary with the key "goal" and the value being the inferred goal.
+"""
+
+_FRAGMENT_ANALYSIS_SYSTEM = """Analyze a prompt for an LLM, keeping in mind its goal.
+
+Divide the prompt into fragments and analyze each fragment. For each fragment, determine:
+1. The type (instruction, context, example, or constraint)
+2. How well it aligns with the goal (1-5, where 5 is perfectly aligned)
+3. A suggestion for improvement to better align with the goal
+
+Provide your analysis in the following JSON format without any other text:
+{
+  "fragments": [
+    {
+      "text": "fragment text",
+      "type": "fragment type",
+      "goal_alignment": alignment_score,
+      "improvement_suggestion": "suggestion to better align with goal"
+    },
+    ...
+  ]
+}
+"""
+
+_LOG_ANALYSIS_SYSTEM = """Analyze a prompt for an LLM, keeping in mind its goal.
+
+Generate a list of logs (info, warnings, or errors) based on the changes being made to the prompt. Focus on aspects that are relevant to achieving the goal.
+
+Provide your analysis in the following JSON format without any other text:
+{
+  "logs": [
+    {
+      "type": "info/warning/error",
+      "message": "log message relevant to achieving the goal"
+    },
+    ...
+  ]
+}
+"""
+
+_PROMPT_ANALYSIS_SYSTEM = """Analyze a prompt for an LLM, keeping in mind its inferred or provided goal.
+
+Provide an overall analysis including:
+1. Overall alignment of the prompt with the goal (1-10)
+2. List of suggested improvements to better achieve the goal
+3. Estimated effectiveness of the prompt in achieving the goal (1-10)
+
+Provide your analysis in the following JSON format without any other text:
+{
+  "overall_goal_alignment": overall_alignment_score,
+  "suggested_improvements": ["improvement1", "improvement2", ...],
+  "estimated_effectiveness": effectiveness_score
+}
+"""
+
+_TEST_GENERATION_SYSTEM = """Generate a test case for an LLM prompt, keeping in mind its goal.
+
+Provide a test case that is relevant to achieving the goal. Use the following JSON format:
+{
+  "input": {
+    "variable1": "value1",
+    "variable2": "value2",
+    ...
+  },
+  "expected_output": "expected output for the test case",
+  "goal_relevance": relevance_score
+}
+
+The input should include values for all variables found in the prompt.
+The goal_relevance score should be from 1-5, where 5 means the test case is highly relevant to achieving the goal.
+"""
+
+# JSON schemas for structured outputs, matching the formats described above. Strict
+# schemas are enforced exactly by providers that support it (such as OpenAI), so the
+# response always parses. The test-generation schemas cannot be strict, since strict
+# mode does not allow the free-form mapping of variable names used for the test input.
+_GOAL_SCHEMA = {
+    "name": "goal_inference",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"goal": {"type": "string"}},
+        "required": ["goal"],
+        "additionalProperties": False,
+    },
+}
+
+_FRAGMENTS_SCHEMA = {
+    "name": "fragment_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "fragments": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "text": {"type": "string"},
+                        "type": {
+                            "type": "string",
+                            "enum": ["instruction", "context", "example", "constraint"],
+                        },
+                        "goal_alignment": {"type": "integer"},
+                        "improvement_suggestion": {"type": "string"},
+                    },
+                    "required": ["text", "type", "goal_alignment", "improvement_suggestion"],
+                    "additionalProperties": False,
+                },
+            }
+        },
+        "required": ["fragments"],
+        "additionalProperties": False,
+    },
+}
+
+_LOGS_SCHEMA = {
+    "name": "log_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "logs": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "type": {"type": "string", "enum": ["info", "warning", "error"]},
+                        "message": {"type": "string"},
+                    },
+                    "required": ["type", "message"],
+                    "additionalProperties": False,
+                },
+            }
+        },
+        "required": ["logs"],
+        "additionalProperties": False,
+    },
+}
+
+_PROMPT_ANALYSIS_SCHEMA = {
+    "name": "prompt_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "overall_goal_alignment": {"type": "integer"},
+            "suggested_improvements": {"type": "array", "items": {"type": "string"}},
+            "estimated_effectiveness": {"type": "integer"},
+        },
+        "required": [
+            "overall_goal_alignment",
+            "suggested_improvements",
+            "estimated_effectiveness",
+        ],
+        "additionalProperties": False,
+    },
+}
+
+_TEST_SCHEMA = {
+    "name": "test_generation",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "input": {"type": "object", "additionalProperties": {"type": "string"}},
+            "expected_output": {"type": "string"},
+            "goal_relevance": {"type": "integer"},
+        },
+        "required": ["input", "expected_output", "goal_relevance"],
+        "additionalProperties": False,
+    },
+}
+
+_COMBINED_ANALYSIS_SYSTEM = """Analyze a prompt for an LLM in full, keeping in mind its goal. If no goal is provided, first infer the likely goal or intention of the user in one sentence.
+
+Then, in a single response:
+1. Divide the prompt into fragments. For each fragment, determine its type (instruction, context, example, or constraint), how well it aligns with the goal (1-5, where 5 is perfectly aligned) and a suggestion for improvement to better align with the goal
+2. Generate a list of logs (info, warnings, or errors) relevant to achieving the goal
+3. Rate the overall alignment of the prompt with the goal (1-10), list suggested improvements and estimate the effectiveness of the prompt in achieving the goal (1-10)
+4. Generate a test case relevant to achieving the goal, with values for all variables found in the prompt and a goal_relevance score from 1-5
+
+Provide your analysis in the following JSON format without any other text:
+{
+  "goal": "the provided or inferred goal",
+  "fragments": [
+    {
+      "text": "fragment text",
+      "type": "fragment type",
+      "goal_alignment": alignment_score,
+      "improvement_suggestion": "suggestion to better align with goal"
+    },
+    ...
+  ],
+  "logs": [
+    {
+      "type": "info/warning/error",
+      "message": "log message relevant to achieving the goal"
+    },
+    ...
+  ],
+  "overall_goal_alignment": overall_alignment_score,
+  "suggested_improvements": ["improvement1", "improvement2", ...],
+  "estimated_effectiveness": effectiveness_score,
+  "test": {
+    "input": {"variable1": "value1", ...},
+    "expected_output": "expected output for the test case",
+    "goal_relevance": relevance_score
+  }
+}
+"""
+
+_COMBINED_ANALYSIS_SCHEMA = {
+    "name": "combined_analysis",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "goal": _GOAL_SCHEMA["schema"]["properties"]["goal"],
+            "fragments": _FRAGMENTS_SCHEMA["schema"]["properties"]["fragments"],
+            "logs": _LOGS_SCHEMA["schema"]["properties"]["logs"],
+            **_PROMPT_ANALYSIS_SCHEMA["schema"]["properties"],
+            "test": _TEST_SCHEMA["schema"],
+        },
+        "required": [
+            "goal",
+            "fragments",
+            "logs",
+            *_PROMPT_ANALYSIS_SCHEMA["schema"]["required"],
+            "test",
+        ],
+        "additionalProperties": False,
+    },
+}
+
+# User-message templates holding the prompt-specific part of each judge request
+_GOAL_INFERENCE_TEMPLATE = "Prompt: {prompt}"
+_PROMPT_GOAL_TEMPLATE = "Prompt: {prompt}\n\nGoal: {goal}"
+_PROMPT_ANALYSIS_TEMPLATE_INFERRED = "Prompt: {prompt}\n\nInferred Goal: {goal}"
+_PROMPT_ANALYSIS_TEMPLATE_PROVIDED = "Prompt: {prompt}\n\nProvided Goal: {goal}"
+_COMBINED_ANALYSIS_TEMPLATE_INFERRED = (
+    "Prompt: {prompt}\n\nGoal: not provided, infer it\n\n"
+    "Variables found in the prompt: {variables}"
+)
+_COMBINED_ANALYSIS_TEMPLATE_PROVIDED = (
+    "Prompt: {prompt}\n\nProvided Goal: {goal}\n\n"
+    "Variables found in the prompt: {variables}"
+)
+_TEST_GENERATION_TEMPLATE = (
+    "Prompt: {prompt}\n\nGoal: {goal}\n\nVariables found in the prompt: {variables}"
+)
+
+
+def _extract_json(text: str) -> Any:
+    """Parse the JSON object in a judge model response.
+    
+    Models sometimes wrap the object in markdown code fences or surround it with
+    prose. Rather than failing (and wasting the LLM call), the first balanced
+    ``{...}`` block in the text is parsed when the whole text is not valid JSON.
+    
+    Raises:
+        JSONDecodeError: If no valid JSON object can be found
+    """
+    try:
+        return _json_loads(text)
+    except _JSONDecodeError:
+        start = text.find("{")
+        if start == -1:
+            raise
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for end in range(start, len(text)):
+        char = text[end]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return _json_loads(text[start : end + 1])
+    return _json_loads(text[start:])
+
+
+class _StreamedArrayItems:
+    """Pull completed items out of a JSON array while its text is being streamed.
+    
+    Items of the array stored under ``key`` are returned by :meth:`feed` as soon as
+    their closing bracket arrives, so they can be used before the rest of the
+    response has been generated.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, key: str):
+        self._start_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._text = ""
+        self._pos: Optional[int] = None
+        self._done = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Add streamed text and return the items completed by it."""
+        self._text += text
+        if self._pos is None:
+            match = self._start_re.search(self._text)
+            if match is None:
+                return []
+            self._pos = match.end()
+
+        items = []
+        while not self._done:
+            pos = self._pos
+            while pos < len(self._text) and self._text[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(self._text):
+                break
+            if self._text[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, self._pos = self._decoder.raw_decode(self._text, pos)
+            except json.JSONDecodeError:
+                # The item is still incomplete
+                break
+            items.append(item)
+        return items
+
+
+def _goal_inference_prompt(prompt: str) -> str:
+    """Build the user message used to infer a prompt's goal."""
+    return _GOAL_INFERENCE_TEMPLATE.format(prompt=prompt)
+
+
+def _parse_goal(response: str) -> str:
+    """Parse the judge model's goal inference response."""
+    try:
+        return _extract_json(response)["goal"]
+    except (_JSONDecodeError, KeyError):
+        # Fallback if JSON parsing fails
+        return response.strip()
+
+
+def _fragment_analysis_prompt(prompt: str, goal: str) -> str:
+    """Build the user message used for fragment analysis."""
+    return _PROMPT_GOAL_TEMPLATE.format(prompt=prompt, goal=goal)
+
+
+def _parse_fragments(response: str) -> List[Fragment]:
+    """Parse the judge model's fragment analysis response."""
+    try:
+        analysis = _extract_json(response)
+        return [Fragment(**fragment) for fragment in analysis["fragments"]]
+    except (_JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Failed to parse fragment analysis: {e}")
+
+
+def _log_analysis_prompt(prompt: str, goal: str) -> str:
+    """Build the user message used to generate logs."""
+    return _PROMPT_GOAL_TEMPLATE.format(prompt=prompt, goal=goal)
+
+
+def _parse_logs(response: str) -> List[Log]:
+    """Parse the judge model's log analysis response."""
+    try:
+        analysis = _extract_json(response)
+        return [Log(**log) for log in analysis["logs"]]
+    except (_JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Failed to parse log analysis: {e}")
+
+
+def _prompt_analysis_prompt(prompt: str, goal: str, is_goal_inferred: bool) -> str:
+    """Build the user message used for the overall prompt analysis."""
+    template = (
+        _PROMPT_ANALYSIS_TEMPLATE_INFERRED
+        if is_goal_inferred
+        else _PROMPT_ANALYSIS_TEMPLATE_PROVIDED
+    )
+    return template.format(prompt=prompt, goal=goal)
+
+
+def _parse_prompt_analysis(
+    response: str, goal: str, is_goal_inferred: bool
+) -> PromptAnalysis:
+    """Parse the judge model's overall prompt analysis response."""
+    try:
+        analysis = _extract_json(response)
+        analysis["inferred_goal"] = goal if is_goal_inferred else ""
+        analysis["is_goal_inferred"] = is_goal_inferred
+        return PromptAnalysis(**analysis)
+    except (_JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Failed to parse prompt analysis: {e}")
+
+
+def _test_generation_prompt(prompt: str, goal: str) -> str:
+    """Build the user message used to generate a test case."""
+    # Each variable is listed once, in order of first appearance
+    variables = dict.fromkeys(_VAR_RE.findall(prompt))
+
+    return _TEST_GENERATION_TEMPLATE.format(
+        prompt=prompt, goal=goal, variables=", ".join(variables)
+    )
+
+
+def _parse_test(response: str) -> Test:
+    """Parse the judge model's test generation response."""
+    try:
+        test_data = _extract_json(response)
+        return Test(**test_data)
+    except (_JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Failed to parse test generation: {e}")
+
+
+def _combined_analysis_prompt(prompt: str, goal: Optional[str]) -> str:
+    """Build the user message used for the combined analysis."""
+    variables = ", ".join(dict.fromkeys(_VAR_RE.findall(prompt)))
+    if goal is None:
+        return _COMBINED_ANALYSIS_TEMPLATE_INFERRED.format(
+            prompt=prompt, variables=variables
+        )
+    return _COMBINED_ANALYSIS_TEMPLATE_PROVIDED.format(
+        prompt=prompt, goal=goal, variables=variables
+    )
+
+
+def _parse_combined_analysis(response: str, goal: Optional[str]) -> "FullAnalysis":
+    """Parse the judge model's combined analysis response."""
+    try:
+        data = _extract_json(response)
+        is_goal_inferred = goal is None
+        if is_goal_inferred:
+            goal = data["goal"]
+        return FullAnalysis(
+            goal,
+            is_goal_inferred,
+            [Fragment(**fragment) for fragment in data["fragments"]],
+            [Log(**log) for log in data["logs"]],
+            PromptAnalysis(
+                overall_goal_alignment=data["overall_goal_alignment"],
+                suggested_improvements=data["suggested_improvements"],
+                estimated_effectiveness=data["estimated_effectiveness"],
+                inferred_goal=goal if is_goal_inferred else "",
+                is_goal_inferred=is_goal_inferred,
+            ),
+            Test(**data["test"]),
+        )
+    except (_JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Failed to parse combined analysis: {e}")
+
+
+# Explicit goal statements, e.g. "Goal: ..." or "Your goal is to ..."
+_GOAL_MARKER_RES = (
+    re.compile(r"^\s*(?:goal|purpose|objective):\s+(.+?)\s*$", re.I | re.M),
+    re.compile(
+        r"\byour (?:goal|purpose|objective|task) is to (.+?)(?:\.(?:\s|$)|\n|$)",
+        re.I,
+    ),
+)
+
+# An extracted goal needs at least this many words, so that values such as
+# "Goal: 4/5" are not mistaken for a goal statement
+_GOAL_MIN_WORDS = 2
+
+
+def _try_extract_goal(prompt: str) -> Optional[str]:
+    """Return the goal if the prompt states it explicitly, else None."""
+    for goal_re in _GOAL_MARKER_RES:
+        match = goal_re.search(prompt)
+        if match:
+            goal = match.group(1).strip().rstrip(".")
+            # Template placeholders ("Goal: {goal}") are filled in later, so the
+            # actual goal is unknown
+            if _VAR_RE.search(goal):
+                continue
+            if len(re.findall(r"[^\W\d_]{2,}", goal)) < _GOAL_MIN_WORDS:
+                continue
+            return goal[0].upper() + goal[1:]
+    return None
+
+
 def infer_goal(prompt: str, model: str) -> str:
     """Infer the goal of a prompt using an LLM.
     
@@ -190,21 +1272,23 @@ def infer_goal(prompt: str, model: str) -> str:
         'Help users find information about books'
         
     Note:
-        If the judge model fails to return properly formatted JSON, the function will
-        fall back to returning the raw response text.
+        Prompts that state their goal explicitly (e.g. "Goal: ..." or "Your goal is
+        to ...") are answered without calling the judge model. If the judge model fails
+        to return properly formatted JSON, the function will fall back to returning the
+        raw response text.
     """
-    inference_prompt = f"""Given the following prompt, infer the likely goal or intention of the user:
+    goal = _try_extract_goal(prompt)
+    if goal:
+        return goal
 
-Prompt: {prompt}
-
-Provide a concise statement of the inferred goal in one sentence as a JSON dictionary with the key "goal" and the value being the inferred goal.
-"""
-    response = get_llm_response(model, inference_prompt)
-    try:
-        return json.loads(response)["goal"]
-    except (json.JSONDecodeError, KeyError):
-        # Fallback if JSON parsing fails
-        return response.strip()
+    response = get_llm_response(
+        model,
+        _goal_inference_prompt(prompt),
+        system=_GOAL_INFERENCE_SYSTEM,
+        json_mode=True,
+        schema=_GOAL_SCHEMA,
+    )
+    return _parse_goal(response)
 
 
 def analyze_fragments(
@@ -246,37 +1330,17 @@ def analyze_fragments(
     if goal is None:
         goal = infer_goal(prompt, judge_model)
 
-    llm_prompt = f"""Analyze the following prompt for an LLM, keeping in mind the goal:
-
-Prompt: {prompt}
-
-Goal: {goal}
-
-Divide the prompt into fragments and analyze each fragment. For each fragment, determine:
-1. The type (instruction, context, example, or constraint)
-2. How well it aligns with the goal (1-5, where 5 is perfectly aligned)
-3. A suggestion for improvement to better align with the goal
-
-Provide your analysis in the following JSON format without any other text:
-{{
-  "fragments": [
-    {{
-      "text": "fragment text",
-      "type": "fragment type",
-      "goal_alignment": alignment_score,
-      "improvement_suggestion": "suggestion to better align with goal"
-    }},
-    ...
-  ]
-}}
-"""
-
-    response = get_llm_response(judge_model, llm_prompt)
-    try:
-        analysis = json.loads(response)
-        return [Fragment(**fragment) for fragment in analysis["fragments"]]
-    except (json.JSONDecodeError, KeyError) as e:
-        raise ValueError(f"Failed to parse fragment analysis: {e}")
+    user_message = _fragment_analysis_prompt(prompt, goal)
+    response = get_llm_response(
+        judge_model,
+        user_message,
+        system=_FRAGMENT_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_FRAGMENTS_SCHEMA,
+    )
+    return _parse_judge_response(
+        _parse_fragments, response, judge_model, user_message, _FRAGMENT_ANALYSIS_SYSTEM
+    )
 
 
 def analyze_logs(prompt: str, judge_model: str, goal: Optional[str] = None) -> List[Log]:
@@ -314,36 +1378,24 @@ def analyze_logs(prompt: str, judge_model: str, goal: Optional[str] = None) -> L
     if goal is None:
         goal = infer_goal(prompt, judge_model)
 
-    llm_prompt = f"""Analyze the following prompt for an LLM, keeping in mind the goal:
-
-Prompt: {prompt}
-
-Goal: {goal}
-
-Generate a list of logs (info, warnings, or errors) based on the changes being made to the prompt. Focus on aspects that are relevant to achieving the goal.
-
-Provide your analysis in the following JSON format without any other text:
-{{
-  "logs": [
-    {{
-      "type": "info/warning/error",
-      "message": "log message relevant to achieving the goal"
-    }},
-    ...
-  ]
-}}
-"""
-
-    response = get_llm_response(judge_model, llm_prompt)
-    try:
-        analysis = json.loads(response)
-        return [Log(**log) for log in analysis["logs"]]
-    except (json.JSONDecodeError, KeyError) as e:
-        raise ValueError(f"Failed to parse log analysis: {e}")
+    user_message = _log_analysis_prompt(prompt, goal)
+    response = get_llm_response(
+        judge_model,
+        user_message,
+        system=_LOG_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_LOGS_SCHEMA,
+    )
+    return _parse_judge_response(
+        _parse_logs, response, judge_model, user_message, _LOG_ANALYSIS_SYSTEM
+    )
 
 
 def analyze_prompt(
-    prompt: str, judge_model: str, goal: Optional[str] = None
+    prompt: str,
+    judge_model: str,
+    goal: Optional[str] = None,
+    is_goal_inferred: bool = False,
 ) -> PromptAnalysis:
     """Perform a comprehensive analysis of a prompt.
     
@@ -362,6 +1414,9 @@ def analyze_prompt(
         judge_model (str): The judge LLM model to use for analysis (e.g., "gpt-4o")
         goal (Optional[str], optional): The goal of the prompt. If not provided,
             it will be inferred using the judge model. Defaults to None.
+        is_goal_inferred (bool, optional): Mark an explicitly passed goal as inferred,
+            e.g. when it was inferred once up front for several analyses.
+            Defaults to False.
             
     Returns:
         PromptAnalysis: A PromptAnalysis object with comprehensive analysis results
@@ -377,41 +1432,35 @@ def analyze_prompt(
         >>> for suggestion in analysis.suggested_improvements:
         ...     print(f"Suggestion: {suggestion}")
     """
-    is_goal_inferred = False
     if goal is None:
         goal = infer_goal(prompt, judge_model)
         is_goal_inferred = True
 
-    llm_prompt = f"""Analyze the following prompt for an LLM, keeping in mind the {'inferred' if is_goal_inferred else 'provided'} goal:
-
-Prompt: {prompt}
-
-{'Inferred' if is_goal_inferred else 'Provided'} Goal: {goal}
-
-Provide an overall analysis including:
-1. Overall alignment of the prompt with the goal (1-10)
-2. List of suggested improvements to better achieve the goal
-3. Estimated effectiveness of the prompt in achieving the goal (1-10)
-
-Provide your analysis in the following JSON format without any other text:
-{{
-  "overall_goal_alignment": overall_alignment_score,
-  "suggested_improvements": ["improvement1", "improvement2", ...],
-  "estimated_effectiveness": effectiveness_score,
-  "inferred_goal": "{goal if is_goal_inferred else ''}",
-  "is_goal_inferred": {str(is_goal_inferred).lower()}
-}}
-"""
-
-    response = get_llm_response(judge_model, llm_prompt)
-    try:
-        analysis = json.loads(response)
-        return PromptAnalysis(**analysis)
-    except (json.JSONDecodeError, KeyError) as e:
-        raise ValueError(f"Failed to parse prompt analysis: {e}")
+    user_message = _prompt_analysis_prompt(prompt, goal, is_goal_inferred)
+    response = get_llm_response(
+        judge_model,
+        user_message,
+        system=_PROMPT_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_PROMPT_ANALYSIS_SCHEMA,
+    )
+    return _parse_judge_response(
+        _parse_prompt_analysis,
+        response,
+        judge_model,
+        user_message,
+        _PROMPT_ANALYSIS_SYSTEM,
+        goal,
+        is_goal_inferred,
+    )
 
 
-def generate_test(prompt: str, judge_model: str, goal: Optional[str] = None) -> Test:
+def generate_test(
+    prompt: str,
+    judge_model: str,
+    goal: Optional[str] = None,
+    target_model: Optional[str] = None,
+) -> Test:
     """Generate a test case for a prompt.
     
     This function generates structured test cases to validate prompt performance.
@@ -426,6 +1475,9 @@ def generate_test(prompt: str, judge_model: str, goal: Optional[str] = None) ->
         judge_model (str): The judge LLM model to use for test generation (e.g., "gpt-4o")
         goal (Optional[str], optional): The goal of the prompt. If not provided,
             it will be inferred using the judge model. Defaults to None.
+        target_model (Optional[str], optional): The target LLM model for the prompt.
+            If given and the prompt has no variables, the test case is built from the
+            target model's output without calling the judge model. Defaults to None.
             
     Returns:
         Test: A Test object with the generated test case
@@ -440,40 +1492,28 @@ def generate_test(prompt: str, judge_model: str, goal: Optional[str] = None) ->
         >>> print(f"Expected: {test_case.expected_output}")
         >>> print(f"Relevance: {test_case.goal_relevance}/5")
     """
+    if target_model is not None and not _VAR_RE.search(prompt):
+        # A static prompt has no inputs to generate, so the test case is just
+        # the target model's output for it
+        return Test(
+            input={},
+            expected_output=execute_prompt(prompt, target_model),
+            goal_relevance=5,
+        )
+
     if goal is None:
         goal = infer_goal(prompt, judge_model)
 
-    variables = re.findall(r"\{([^}]+)\}", prompt)
-
-    llm_prompt = f"""Generate a test case for the following LLM prompt, keeping in mind the goal:
-
-Prompt: {prompt}
-
-Goal: {goal}
-
-Variables found in the prompt: {', '.join(variables)}
-
-Provide a test case that is relevant to achieving the goal. Use the following JSON format:
-{{
-  "input": {{
-    "variable1": "value1",
-    "variable2": "value2",
-    ...
-  }},
-  "expected_output": "expected output for the test case",
-  "goal_relevance": relevance_score
-}}
-
-The input should include values for all variables found in the prompt.
-The goal_relevance score should be from 1-5, where 5 means the test case is highly relevant to achieving the goal.
-"""
-
-    response = get_llm_response(judge_model, llm_prompt)
-    try:
-        test_data = json.loads(response)
-        return Test(**test_data)
-    except (json.JSONDecodeError, KeyError) as e:
-        raise ValueError(f"Failed to parse test generation: {e}")
+    # Each call should produce a new test case, so the response is never cached
+    response = get_llm_response(
+        judge_model,
+        _test_generation_prompt(prompt, goal),
+        no_cache=True,
+        system=_TEST_GENERATION_SYSTEM,
+        json_mode=True,
+        schema=_TEST_SCHEMA,
+    )
+    return _parse_test(response)
 
 
 def execute_prompt(prompt: str, target_model: str) -> str:
@@ -496,3 +1536,499 @@ def execute_prompt(prompt: str, target_model: str) -> str:
         'Quantum computing is a type of computing that uses quantum bits...'
     """
     return get_llm_response(target_model, prompt)
+
+
+class PromptSession:
+    """Analysis session for a single prompt that infers its goal only once.
+    
+    Each standalone analysis function infers the goal when none is given, so running
+    several of them on the same prompt would repeat the same judge-model call. A session
+    resolves the goal when it is created and passes it to every analysis.
+    
+    Attributes:
+        prompt (str): The prompt being analyzed
+        judge_model (str): The judge LLM model used for analysis
+        goal (str): The provided or inferred goal of the prompt
+        is_goal_inferred (bool): Whether the goal was inferred or explicitly provided
+    
+    Example:
+        >>> session = PromptSession("Answer questions about books.", "gpt-4o")
+        >>> print(session.goal)
+        >>> fragments = session.fragments()
+        >>> analysis = session.analyze()
+    """
+    def __init__(self, prompt: str, judge_model: str, goal: Optional[str] = None):
+        self.prompt = prompt
+        self.judge_model = judge_model
+        self.is_goal_inferred = goal is None
+        self.goal = infer_goal(prompt, judge_model) if goal is None else goal
+
+    def fragments(self) -> List[Fragment]:
+        """Analyze the prompt's fragments. See :func:`analyze_fragments`."""
+        return analyze_fragments(self.prompt, self.judge_model, self.goal)
+
+    def logs(self) -> List[Log]:
+        """Generate logs for the prompt. See :func:`analyze_logs`."""
+        return analyze_logs(self.prompt, self.judge_model, self.goal)
+
+    def analyze(self) -> PromptAnalysis:
+        """Analyze the prompt as a whole. See :func:`analyze_prompt`."""
+        return analyze_prompt(
+            self.prompt, self.judge_model, self.goal, self.is_goal_inferred
+        )
+
+    def test(self) -> Test:
+        """Generate a test case for the prompt. See :func:`generate_test`."""
+        return generate_test(self.prompt, self.judge_model, self.goal)
+
+
+def execute_prompt_stream(prompt: str, target_model: str) -> Iterator[str]:
+    """Execute a prompt and yield the response incrementally as it is generated.
+    
+    This is the streaming counterpart to :func:`execute_prompt`: text is yielded as
+    soon as the target LLM produces it, rather than after the whole response is
+    complete. Cached responses are yielded in one piece.
+    
+    Args:
+        prompt (str): The prompt to execute
+        target_model (str): The target LLM model to use for execution (e.g., "gpt-4o")
+        
+    Yields:
+        str: Successive pieces of the response text
+        
+    Example:
+        >>> for text in execute_prompt_stream("Write a short poem.", "gpt-4o"):
+        ...     print(text, end="", flush=True)
+    """
+    _ensure_env()
+    max_tokens = 1000
+    cached = _cache_lookup(target_model, prompt, max_tokens, False)
+    if cached is not None:
+        yield cached
+        return
+
+    response = completion(
+        model=target_model,
+        messages=_build_messages(prompt),
+        max_tokens=max_tokens,
+        stream=True,
+    )
+    pieces = []
+    for chunk in response:
+        text = chunk.choices[0].delta.content or ""
+        if text:
+            pieces.append(text)
+            yield text
+    _cache_store(target_model, prompt, max_tokens, False, "".join(pieces))
+
+
+# Judge responses longer than this (in characters) are parsed in a worker thread,
+# so that parsing a large analysis does not hold up the event loop
+_THREAD_PARSE_THRESHOLD = 4096
+
+
+async def _aparse(
+    parser: Any, response: str, model: str, prompt: str, system: str, *args: Any
+) -> Any:
+    """Async version of :func:`_parse_judge_response`.
+    
+    Large responses are parsed in a worker thread.
+    """
+    if len(response) > _THREAD_PARSE_THRESHOLD:
+        return await asyncio.to_thread(
+            _parse_judge_response, parser, response, model, prompt, system, *args
+        )
+    return _parse_judge_response(parser, response, model, prompt, system, *args)
+
+
+async def ainfer_goal(prompt: str, model: str) -> str:
+    """Async version of :func:`infer_goal`."""
+    goal = _try_extract_goal(prompt)
+    if goal:
+        return goal
+
+    response = await aget_llm_response(
+        model,
+        _goal_inference_prompt(prompt),
+        system=_GOAL_INFERENCE_SYSTEM,
+        json_mode=True,
+        schema=_GOAL_SCHEMA,
+    )
+    return _parse_goal(response)
+
+
+async def aanalyze_fragments(
+    prompt: str, judge_model: str, goal: Optional[str] = None
+) -> List[Fragment]:
+    """Async version of :func:`analyze_fragments`."""
+    if goal is None:
+        goal = await ainfer_goal(prompt, judge_model)
+
+    user_message = _fragment_analysis_prompt(prompt, goal)
+    response = await aget_llm_response(
+        judge_model,
+        user_message,
+        system=_FRAGMENT_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_FRAGMENTS_SCHEMA,
+    )
+    return await _aparse(
+        _parse_fragments, response, judge_model, user_message, _FRAGMENT_ANALYSIS_SYSTEM
+    )
+
+
+async def aanalyze_fragments_stream(
+    prompt: str, judge_model: str, goal: Optional[str] = None
+) -> AsyncIterator[Fragment]:
+    """Analyze the fragments of a prompt, yielding each fragment as it is generated.
+    
+    Like :func:`aanalyze_fragments`, but the judge response is streamed and every
+    fragment is yielded once its JSON object is complete, so the first results
+    arrive long before the whole analysis has been generated.
+    
+    Args:
+        prompt (str): The prompt to analyze
+        judge_model (str): The judge LLM model to use for analysis (e.g., "gpt-4o")
+        goal (Optional[str], optional): The goal of the prompt. If not provided,
+            it will be inferred using the judge model. Defaults to None.
+    
+    Yields:
+        Fragment: The analyzed fragments, in prompt order
+    
+    Raises:
+        ValueError: If the judge model response cannot be parsed as valid JSON. This
+            can happen after some fragments were yielded, e.g. if the response was
+            cut off.
+    
+    Example:
+        >>> async for fragment in aanalyze_fragments_stream(prompt, "gpt-4o"):
+        ...     print(f"{fragment.type}: {fragment.goal_alignment}/5")
+    """
+    if goal is None:
+        goal = await ainfer_goal(prompt, judge_model)
+
+    _ensure_env()
+    user_message = _fragment_analysis_prompt(prompt, goal)
+    max_tokens = 1000
+    cached = _cache_lookup(
+        judge_model, user_message, max_tokens, True, _FRAGMENT_ANALYSIS_SYSTEM
+    )
+    if cached is not None:
+        for fragment in _parse_judge_response(
+            _parse_fragments, cached, judge_model, user_message, _FRAGMENT_ANALYSIS_SYSTEM
+        ):
+            yield fragment
+        return
+
+    response = await acompletion(
+        model=judge_model,
+        messages=_build_messages(user_message, _FRAGMENT_ANALYSIS_SYSTEM),
+        max_tokens=max_tokens,
+        stream=True,
+        **_completion_options(judge_model, True, _FRAGMENTS_SCHEMA),
+    )
+    items = _StreamedArrayItems("fragments")
+    pieces = []
+    streamed = 0
+    async for chunk in response:
+        text = chunk.choices[0].delta.content or ""
+        if text:
+            pieces.append(text)
+            for fragment in items.feed(text):
+                streamed += 1
+                try:
+                    fragment = Fragment(**fragment)
+                except TypeError as e:
+                    raise ValueError(f"Failed to parse fragment analysis: {e}")
+                yield fragment
+
+    # The whole response is checked before it is cached, so a truncated or
+    # malformed response is not reused
+    content = "".join(pieces)
+    fragments = _parse_fragments(content)
+    if not streamed:
+        # Fall back to the parsed response, e.g. if it was not laid out as expected
+        for fragment in fragments:
+            yield fragment
+    _cache_store(
+        judge_model, user_message, max_tokens, True, content, _FRAGMENT_ANALYSIS_SYSTEM
+    )
+
+
+async def aanalyze_logs(
+    prompt: str, judge_model: str, goal: Optional[str] = None
+) -> List[Log]:
+    """Async version of :func:`analyze_logs`."""
+    if goal is None:
+        goal = await ainfer_goal(prompt, judge_model)
+
+    user_message = _log_analysis_prompt(prompt, goal)
+    response = await aget_llm_response(
+        judge_model,
+        user_message,
+        system=_LOG_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_LOGS_SCHEMA,
+    )
+    return await _aparse(
+        _parse_logs, response, judge_model, user_message, _LOG_ANALYSIS_SYSTEM
+    )
+
+
+async def aanalyze_prompt(
+    prompt: str,
+    judge_model: str,
+    goal: Optional[str] = None,
+    is_goal_inferred: bool = False,
+) -> PromptAnalysis:
+    """Async version of :func:`analyze_prompt`."""
+    if goal is None:
+        goal = await ainfer_goal(prompt, judge_model)
+        is_goal_inferred = True
+
+    user_message = _prompt_analysis_prompt(prompt, goal, is_goal_inferred)
+    response = await aget_llm_response(
+        judge_model,
+        user_message,
+        system=_PROMPT_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_PROMPT_ANALYSIS_SCHEMA,
+    )
+    return await _aparse(
+        _parse_prompt_analysis,
+        response,
+        judge_model,
+        user_message,
+        _PROMPT_ANALYSIS_SYSTEM,
+        goal,
+        is_goal_inferred,
+    )
+
+
+async def agenerate_test(
+    prompt: str,
+    judge_model: str,
+    goal: Optional[str] = None,
+    target_model: Optional[str] = None,
+) -> Test:
+    """Async version of :func:`generate_test`."""
+    if target_model is not None and not _VAR_RE.search(prompt):
+        return Test(
+            input={},
+            expected_output=await aexecute_prompt(prompt, target_model),
+            goal_relevance=5,
+        )
+
+    if goal is None:
+        goal = await ainfer_goal(prompt, judge_model)
+
+    response = await aget_llm_response(
+        judge_model,
+        _test_generation_prompt(prompt, goal),
+        no_cache=True,
+        system=_TEST_GENERATION_SYSTEM,
+        json_mode=True,
+        schema=_TEST_SCHEMA,
+    )
+    return _parse_test(response)
+
+
+async def aexecute_prompt(prompt: str, target_model: str) -> str:
+    """Async version of :func:`execute_prompt`.
+    
+    Use it with ``asyncio.gather`` to run a prompt on several target models at once.
+    
+    Example:
+        >>> responses = await asyncio.gather(
+        ...     *[aexecute_prompt(prompt, model) for model in ("gpt-4o", "claude-3-haiku-20240307")]
+        ... )
+    """
+    return await aget_llm_response(target_model, prompt)
+
+
+async def aexecute_prompt_stream(prompt: str, target_model: str) -> AsyncIterator[str]:
+    """Async version of :func:`execute_prompt_stream`.
+    
+    Example:
+        >>> async for text in aexecute_prompt_stream("Write a short poem.", "gpt-4o"):
+        ...     print(text, end="", flush=True)
+    """
+    _ensure_env()
+    max_tokens = 1000
+    cached = _cache_lookup(target_model, prompt, max_tokens, False)
+    if cached is not None:
+        yield cached
+        return
+
+    response = await acompletion(
+        model=target_model,
+        messages=_build_messages(prompt),
+        max_tokens=max_tokens,
+        stream=True,
+    )
+    pieces = []
+    async for chunk in response:
+        text = chunk.choices[0].delta.content or ""
+        if text:
+            pieces.append(text)
+            yield text
+    _cache_store(target_model, prompt, max_tokens, False, "".join(pieces))
+
+
+async def full_analysis(
+    prompt: str, judge_model: str, goal: Optional[str] = None
+) -> FullAnalysis:
+    """Run every analysis of a prompt concurrently.
+    
+    The goal is inferred once (unless provided), after which the fragment, log,
+    overall and test-generation analyses are independent and are sent to the judge
+    model concurrently, so the whole analysis takes roughly as long as its slowest call.
+    
+    Args:
+        prompt (str): The prompt to analyze
+        judge_model (str): The judge LLM model to use for analysis (e.g., "gpt-4o")
+        goal (Optional[str], optional): The goal of the prompt. If not provided,
+            it will be inferred using the judge model. Defaults to None.
+    
+    Returns:
+        FullAnalysis: The combined analysis results
+    
+    Raises:
+        ValueError: If a judge model response cannot be parsed as valid JSON
+    
+    Example:
+        >>> import asyncio
+        >>> result = asyncio.run(full_analysis("Answer questions.", "gpt-4o"))
+        >>> print(result.goal)
+        >>> print(f"Alignment: {result.analysis.overall_goal_alignment}/10")
+    """
+    is_goal_inferred = goal is None
+    if goal is None:
+        goal = await ainfer_goal(prompt, judge_model)
+
+    fragments, logs, analysis, test = await asyncio.gather(
+        aanalyze_fragments(prompt, judge_model, goal),
+        aanalyze_logs(prompt, judge_model, goal),
+        aanalyze_prompt(prompt, judge_model, goal, is_goal_inferred=is_goal_inferred),
+        agenerate_test(prompt, judge_model, goal),
+    )
+    return FullAnalysis(goal, is_goal_inferred, fragments, logs, analysis, test)
+
+
+def analyze_all(
+    prompt: str, judge_model: str, goal: Optional[str] = None
+) -> FullAnalysis:
+    """Run every analysis of a prompt in a single batch of judge-model requests.
+    
+    The goal is inferred once (unless provided), after which the fragment, log,
+    overall and test-generation prompts are sent together via :func:`get_llm_responses`.
+    
+    Args:
+        prompt (str): The prompt to analyze
+        judge_model (str): The judge LLM model to use for analysis (e.g., "gpt-4o")
+        goal (Optional[str], optional): The goal of the prompt. If not provided,
+            it will be inferred using the judge model. Defaults to None.
+            
+    Returns:
+        FullAnalysis: The combined analysis results
+        
+    Raises:
+        ValueError: If a judge model response cannot be parsed as valid JSON
+        
+    Example:
+        >>> result = analyze_all("Answer questions.", "gpt-4o")
+        >>> print(result.goal)
+        >>> print(f"Alignment: {result.analysis.overall_goal_alignment}/10")
+    """
+    is_goal_inferred = goal is None
+    if goal is None:
+        goal = infer_goal(prompt, judge_model)
+
+    prompts = [
+        _fragment_analysis_prompt(prompt, goal),
+        _log_analysis_prompt(prompt, goal),
+        _prompt_analysis_prompt(prompt, goal, is_goal_inferred),
+        _test_generation_prompt(prompt, goal),
+    ]
+    systems = [
+        _FRAGMENT_ANALYSIS_SYSTEM,
+        _LOG_ANALYSIS_SYSTEM,
+        _PROMPT_ANALYSIS_SYSTEM,
+        _TEST_GENERATION_SYSTEM,
+    ]
+    # Like generate_test, every call should produce a new test case, so the test
+    # prompt bypasses the cache
+    fragments, logs, analysis, test = get_llm_responses(
+        judge_model,
+        prompts,
+        no_cache=[False, False, False, True],
+        json_mode=True,
+        systems=systems,
+    )
+
+    return FullAnalysis(
+        goal,
+        is_goal_inferred,
+        _parse_judge_response(
+            _parse_fragments, fragments, judge_model, prompts[0], systems[0]
+        ),
+        _parse_judge_response(_parse_logs, logs, judge_model, prompts[1], systems[1]),
+        _parse_judge_response(
+            _parse_prompt_analysis,
+            analysis,
+            judge_model,
+            prompts[2],
+            systems[2],
+            goal,
+            is_goal_inferred,
+        ),
+        _parse_test(test),
+    )
+
+
+def analyze_combined(
+    prompt: str, judge_model: str, goal: Optional[str] = None
+) -> FullAnalysis:
+    """Run every analysis of a prompt in a single judge-model call.
+    
+    Where :func:`full_analysis` and :func:`analyze_all` send one request per analysis
+    (plus one to infer the goal), this asks the judge model for the goal, fragments,
+    logs, overall analysis and a test case in one response. That saves the network
+    round-trips and repeated prompt tokens of the separate calls, at the cost of a
+    longer single response.
+    
+    Args:
+        prompt (str): The prompt to analyze
+        judge_model (str): The judge LLM model to use for analysis
+        goal (Optional[str], optional): The goal of the prompt. If None, the judge
+            model infers it as part of the same call.
+        
+    Returns:
+        FullAnalysis: The combined results of every analysis
+        
+    Raises:
+        ValueError: If the judge model response cannot be parsed as valid JSON
+        
+    Example:
+        >>> result = analyze_combined("Answer questions.", "gpt-4o")
+        >>> print(result.goal)
+        >>> print(f"Alignment: {result.analysis.overall_goal_alignment}/10")
+    """
+    user_message = _combined_analysis_prompt(prompt, goal)
+    response = get_llm_response(
+        judge_model,
+        user_message,
+        max_tokens=4000,
+        system=_COMBINED_ANALYSIS_SYSTEM,
+        json_mode=True,
+        schema=_COMBINED_ANALYSIS_SCHEMA,
+    )
+    return _parse_judge_response(
+        _parse_combined_analysis,
+        response,
+        judge_model,
+        user_message,
+        _COMBINED_ANALYSIS_SYSTEM,
+        goal,
+        max_tokens=4000,
+    )
@@ -0,0 +1,66 @@
+"""
+Request and response models for the Blogus web API.
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from blogus._models import JudgeLLMModel, TargetLLMModel
+
+
+class FragmentAnalysisRequest(BaseModel):
+    prompt: str
+    target_model: TargetLLMModel
+    judge_model: JudgeLLMModel
+    goal: Optional[str] = None
+
+class FragmentResponse(BaseModel):
+    text: str
+    type: str
+    goal_alignment: int
+    improvement_suggestion: str
+
+class LogResponse(BaseModel):
+    type: str
+    message: str
+
+class PromptAnalysisRequest(BaseModel):
+    prompt: str
+    target_model: TargetLLMModel
+    judge_model: JudgeLLMModel
+    goal: Optional[str] = None
+
+class PromptAnalysisResponse(BaseModel):
+    overall_goal_alignment: int
+    suggested_improvements: List[str]
+    estimated_effectiveness: int
+    inferred_goal: Optional[str] = None
+    is_goal_inferred: bool
+
+class TestGenerationRequest(BaseModel):
+    prompt: str
+    target_model: TargetLLMModel
+    judge_model: JudgeLLMModel
+    goal: Optional[str] = None
+
+class TestResponse(BaseModel):
+    input: Dict[str, str]
+    expected_output: str
+    goal_relevance: int
+
+class PromptExecutionRequest(BaseModel):
+    prompt: str
+    target_model: TargetLLMModel
+
+class GoalInferenceRequest(BaseModel):
+    prompt: str
+    judge_model: JudgeLLMModel
+
+class FullAnalysisResponse(BaseModel):
+    goal: str
+    is_goal_inferred: bool
+    fragments: List[FragmentResponse]
+    logs: List[LogResponse]
+    analysis: PromptAnalysisResponse
+    test: TestResponse
@@ -0,0 +1,234 @@
+"""
+Semantic response cache for Blogus.
+
+The exact-match cache in :mod:`blogus.cache` only helps when a prompt is sent
+again byte-for-byte. This module adds a second layer that embeds prompts and
+returns a previously cached response when a new prompt is close enough in
+meaning (cosine similarity above a threshold), e.g. "Help me find books" vs
+"Assistant for book discovery".
+
+The cache is opt-in and requires the ``semantic`` extras
+(``pip install blogus[semantic]``), which provide ``numpy`` and
+``sentence-transformers``. Enable it with the ``BLOGUS_SEMANTIC_CACHE``
+environment variable and tune the threshold with
+``BLOGUS_SEMANTIC_CACHE_THRESHOLD`` (defaults to 0.95). Set
+``BLOGUS_SEMANTIC_CACHE_PATH`` to keep the cache on disk between runs. When
+``faiss`` is installed (``pip install blogus[faiss]``) it is used for the
+similarity search.
+"""
+
+import functools
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.95
+
+
+@functools.lru_cache(maxsize=1)
+def _faiss() -> Any:
+    """Import faiss on first use, or return None if it is not installed.
+
+    faiss is slow to import, so it is only loaded once the cache is searched.
+    """
+    try:
+        import faiss
+    except ImportError:
+        return None
+    return faiss
+
+
+class SemanticCache:
+    """In-memory cache of LLM responses looked up by embedding similarity.
+
+    Entries are grouped by namespace (for example the model name and token
+    limit) so that a response is only ever reused for the same kind of request.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity for a cached response to be reused
+        path (Optional[str]): File the cache is loaded from and saved to, if any
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        path: Optional[str] = None,
+    ):
+        """Create a semantic cache.
+
+        Args:
+            threshold (float, optional): Minimum cosine similarity for a hit.
+                Defaults to 0.95.
+            model_name (str, optional): sentence-transformers model used to embed
+                prompts. Defaults to "all-MiniLM-L6-v2".
+            embed (Optional[Callable[[str], Sequence[float]]], optional): Custom
+                embedding function. When given, sentence-transformers is not loaded.
+            path (Optional[str], optional): File to persist the cache to. Existing
+                entries are loaded from it. Defaults to None (memory only).
+        """
+        self.threshold = threshold
+        self.path = os.path.expanduser(path) if path else None
+        self._model_name = model_name
+        self._embed = embed
+        self._vectors: Dict[Hashable, List[Any]] = {}
+        self._indexes: Dict[Hashable, Any] = {}
+        self._responses: Dict[Hashable, List[str]] = {}
+        if self.path and os.path.exists(self.path):
+            self.load()
+
+    def _encode(self, text: str) -> Any:
+        """Embed text as a unit-length numpy vector."""
+        import numpy as np
+
+        if self._embed is None:
+            from sentence_transformers import SentenceTransformer
+
+            encoder = SentenceTransformer(self._model_name)
+            self._embed = encoder.encode
+
+        vector = np.asarray(self._embed(text), dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _index(self, namespace: Hashable) -> Any:
+        """Return the search index for a namespace, building it if needed.
+
+        This is a faiss inner-product index when faiss is installed, otherwise a
+        numpy matrix of the stored vectors.
+        """
+        index = self._indexes.get(namespace)
+        if index is None:
+            import numpy as np
+
+            faiss = _faiss()
+            matrix = np.vstack(self._vectors[namespace])
+            if faiss is not None:
+                index = faiss.IndexFlatIP(matrix.shape[1])
+                index.add(matrix)
+            else:
+                index = matrix
+            self._indexes[namespace] = index
+        return index
+
+    def get(self, namespace: Hashable, text: str) -> Optional[str]:
+        """Return the cached response most similar to text, if similar enough.
+
+        Args:
+            namespace (Hashable): Group of entries to search
+            text (str): The prompt to look up
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        if not self._vectors.get(namespace):
+            return None
+
+        import numpy as np
+
+        index = self._index(namespace)
+        vector = self._encode(text)
+        if _faiss() is not None:
+            scores, ids = index.search(vector[np.newaxis, :], 1)
+            score, best = float(scores[0][0]), int(ids[0][0])
+        else:
+            scores = index @ vector
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+
+        if score >= self.threshold:
+            return self._responses[namespace][best]
+        return None
+
+    def add(self, namespace: Hashable, text: str, response: str) -> None:
+        """Store a response for text.
+
+        Args:
+            namespace (Hashable): Group of entries to add to
+            text (str): The prompt that produced the response
+            response (str): The response to cache
+        """
+        vector = self._encode(text)
+        self._vectors.setdefault(namespace, []).append(vector)
+        self._responses.setdefault(namespace, []).append(response)
+
+        index = self._indexes.get(namespace)
+        if _faiss() is not None and index is not None:
+            index.add(vector[None, :])
+        else:
+            self._indexes.pop(namespace, None)
+
+    def discard(self, namespace: Hashable, response: str) -> None:
+        """Remove every entry in a namespace that stores the given response.
+
+        Args:
+            namespace (Hashable): Group of entries to remove from
+            response (str): The response to remove, e.g. one that could not be parsed
+        """
+        responses = self._responses.get(namespace)
+        if not responses or response not in responses:
+            return
+
+        keep = [i for i, cached in enumerate(responses) if cached != response]
+        self._vectors[namespace] = [self._vectors[namespace][i] for i in keep]
+        self._responses[namespace] = [responses[i] for i in keep]
+        # The search index is rebuilt from the remaining vectors on the next lookup
+        self._indexes.pop(namespace, None)
+        if not keep:
+            del self._vectors[namespace]
+            del self._responses[namespace]
+
+    def save(self) -> None:
+        """Write the cache to :attr:`path`. Does nothing if no path is set."""
+        if not self.path:
+            return
+
+        entries = [
+            {
+                "namespace": list(namespace) if isinstance(namespace, tuple) else namespace,
+                "vectors": [vector.tolist() for vector in self._vectors[namespace]],
+                "responses": self._responses[namespace],
+            }
+            for namespace in self._vectors
+        ]
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"model": self._model_name, "entries": entries}, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        """Replace the cache contents with the entries saved at :attr:`path`.
+
+        Entries embedded with a different model are ignored.
+        """
+        import numpy as np
+
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.clear()
+        if data.get("model") != self._model_name:
+            return
+        for entry in data["entries"]:
+            namespace = entry["namespace"]
+            if isinstance(namespace, list):
+                namespace = tuple(namespace)
+            self._vectors[namespace] = [
+                np.asarray(vector, dtype=np.float32) for vector in entry["vectors"]
+            ]
+            self._responses[namespace] = list(entry["responses"])
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._vectors.clear()
+        self._indexes.clear()
+        self._responses.clear()
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
@@ -3,32 +3,59 @@ Web interface for Blogus using FastAPI.
 """
 
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from typing import List
 import json
-import re
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
 
 from blogus.core import (
-    TargetLLMModel,
-    JudgeLLMModel,
-    Fragment,
-    Log,
-    Test,
-    PromptAnalysis,
-    get_llm_response,
-    infer_goal,
-    analyze_fragments,
-    analyze_logs,
-    analyze_prompt,
-    generate_test,
-    execute_prompt,
+    ainfer_goal,
+    aanalyze_fragments,
+    aanalyze_fragments_stream,
+    aanalyze_logs,
+    aanalyze_prompt,
+    agenerate_test,
+    aexecute_prompt,
+    aexecute_prompt_stream,
+    full_analysis,
+    aclose_http_client,
+)
+from blogus.schemas import (
+    FragmentAnalysisRequest,
+    FragmentResponse,
+    LogResponse,
+    PromptAnalysisRequest,
+    PromptAnalysisResponse,
+    TestGenerationRequest,
+    TestResponse,
+    PromptExecutionRequest,
+    GoalInferenceRequest,
+    FullAnalysisResponse,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.path.exists(templates_dir):
+        # Checking templates for changes on every render is only useful while editing them
+        reload = os.getenv("BLOGUS_TEMPLATE_RELOAD", "").lower() in ("1", "true", "yes")
+        templates.env.auto_reload = reload
+        # Compile the page templates before serving, not on the first request for each page
+        for name in ("index.html", "agent.html"):
+            templates.get_template(name)
+    yield
+    # Close the pooled connections to the LLM providers on shutdown
+    await aclose_http_client()
+
+
+# Serialize JSON responses with orjson
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Mount static files and templates
 static_dir = os.path.join(os.path.dirname(__file__), "..", "app", "static")
@@ -41,60 +68,15 @@ if os.path.exists(templates_dir):
     templates = Jinja2Templates(directory=templates_dir)
 
 
-# Request models
-class FragmentAnalysisRequest(BaseModel):
-    prompt: str
-    target_model: TargetLLMModel
-    judge_model: JudgeLLMModel
-    goal: Optional[str] = None
-
-class FragmentResponse(BaseModel):
-    text: str
-    type: str
-    goal_alignment: int
-    improvement_suggestion: str
-
-class LogResponse(BaseModel):
-    type: str
-    message: str
-
-class PromptAnalysisRequest(BaseModel):
-    prompt: str
-    target_model: TargetLLMModel
-    judge_model: JudgeLLMModel
-    goal: Optional[str] = None
-
-class PromptAnalysisResponse(BaseModel):
-    overall_goal_alignment: int
-    suggested_improvements: List[str]
-    estimated_effectiveness: int
-    inferred_goal: Optional[str] = None
-    is_goal_inferred: bool
-
-class TestGenerationRequest(BaseModel):
-    prompt: str
-    target_model: TargetLLMModel
-    judge_model: JudgeLLMModel
-    goal: Optional[str] = None
-
-class TestResponse(BaseModel):
-    input: Dict[str, str]
-    expected_output: str
-    goal_relevance: int
-
-class PromptExecutionRequest(BaseModel):
-    prompt: str
-    target_model: TargetLLMModel
-
-class GoalInferenceRequest(BaseModel):
-    prompt: str
-    judge_model: JudgeLLMModel
+# Validate whole lists of core results in one call, reading their attributes
+_FragmentList = TypeAdapter(List[FragmentResponse])
+_LogList = TypeAdapter(List[LogResponse])
 
 
 @app.post("/api/infer-goal", response_model=str)
 async def infer_goal_endpoint(request: GoalInferenceRequest):
     try:
-        return infer_goal(request.prompt, request.judge_model).strip()
+        return (await ainfer_goal(request.prompt, request.judge_model)).strip()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -102,25 +84,46 @@ async def infer_goal_endpoint(request: GoalInferenceRequest):
 @app.post("/api/analyze-fragments", response_model=List[FragmentResponse])
 async def analyze_fragments_endpoint(request: FragmentAnalysisRequest):
     try:
-        fragments = analyze_fragments(request.prompt, request.judge_model, request.goal)
-        return [
-            FragmentResponse(
-                text=f.text,
-                type=f.type,
-                goal_alignment=f.goal_alignment,
-                improvement_suggestion=f.improvement_suggestion,
-            )
-            for f in fragments
-        ]
+        fragments = await aanalyze_fragments(
+            request.prompt, request.judge_model, request.goal
+        )
+        return _FragmentList.validate_python(fragments, from_attributes=True)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/analyze-fragments/stream")
+async def analyze_fragments_stream_endpoint(request: FragmentAnalysisRequest):
+    # Infer the goal before streaming, so that a failure is still reported as an error
+    # response rather than a stream that ends without any fragments
+    goal = request.goal
+    if goal is None:
+        try:
+            goal = await ainfer_goal(request.prompt, request.judge_model)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    # Send each fragment as a line of JSON as soon as the judge model has generated it
+    async def lines():
+        try:
+            async for fragment in aanalyze_fragments_stream(
+                request.prompt, request.judge_model, goal
+            ):
+                response = FragmentResponse.model_validate(fragment, from_attributes=True)
+                yield response.model_dump_json() + "\n"
+        except Exception as e:
+            # The status has already been sent, so the error ends the stream as its
+            # last line
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.post("/api/analyze-logs", response_model=List[LogResponse])
 async def analyze_logs_endpoint(request: PromptAnalysisRequest):
     try:
-        logs = analyze_logs(request.prompt, request.judge_model, request.goal)
-        return [LogResponse(type=l.type, message=l.message) for l in logs]
+        logs = await aanalyze_logs(request.prompt, request.judge_model, request.goal)
+        return _LogList.validate_python(logs, from_attributes=True)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -128,7 +131,9 @@ async def analyze_logs_endpoint(request: PromptAnalysisRequest):
 @app.post("/api/analyze-prompt", response_model=PromptAnalysisResponse)
 async def analyze_prompt_endpoint(request: PromptAnalysisRequest):
     try:
-        analysis = analyze_prompt(request.prompt, request.judge_model, request.goal)
+        analysis = await aanalyze_prompt(
+            request.prompt, request.judge_model, request.goal
+        )
         return PromptAnalysisResponse(
             overall_goal_alignment=analysis.overall_goal_alignment,
             suggested_improvements=analysis.suggested_improvements,
@@ -143,7 +148,11 @@ async def analyze_prompt_endpoint(request: PromptAnalysisRequest):
 @app.post("/api/generate-test", response_model=TestResponse)
 async def generate_test_endpoint(request: TestGenerationRequest):
     try:
-        test_case = generate_test(request.prompt, request.judge_model, request.goal)
+        # Prompts without template variables are answered by the target model directly,
+        # skipping the judge-model generation call
+        test_case = await agenerate_test(
+            request.prompt, request.judge_model, request.goal, request.target_model
+        )
         return TestResponse(
             input=test_case.input,
             expected_output=test_case.expected_output,
@@ -153,13 +162,61 @@ async def generate_test_endpoint(request: TestGenerationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/analyze-all", response_model=FullAnalysisResponse)
+async def analyze_all_endpoint(request: PromptAnalysisRequest):
+    # Infers the goal once, then runs the fragment, log, overall and test analyses
+    # concurrently instead of the client calling each endpoint in turn
+    try:
+        result = await full_analysis(request.prompt, request.judge_model, request.goal)
+        analysis = result.analysis
+        return FullAnalysisResponse(
+            goal=result.goal,
+            is_goal_inferred=result.is_goal_inferred,
+            fragments=_FragmentList.validate_python(result.fragments, from_attributes=True),
+            logs=_LogList.validate_python(result.logs, from_attributes=True),
+            analysis=PromptAnalysisResponse(
+                overall_goal_alignment=analysis.overall_goal_alignment,
+                suggested_improvements=analysis.suggested_improvements,
+                estimated_effectiveness=analysis.estimated_effectiveness,
+                inferred_goal=analysis.inferred_goal,
+                is_goal_inferred=analysis.is_goal_inferred,
+            ),
+            test=TestResponse(
+                input=result.test.input,
+                expected_output=result.test.expected_output,
+                goal_relevance=result.test.goal_relevance,
+            ),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/execute-prompt", response_model=str)
 async def execute_prompt_endpoint(request: PromptExecutionRequest):
     try:
-        return execute_prompt(request.prompt, request.target_model)
+        return await aexecute_prompt(request.prompt, request.target_model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/execute-prompt/stream")
+async def execute_prompt_stream_endpoint(request: PromptExecutionRequest):
+    # Send the response text as it is generated instead of after the whole response.
+    # The first piece is awaited here so that provider errors, which are raised when
+    # the request is made, are reported as a 500 like in /api/execute-prompt.
+    stream = aexecute_prompt_stream(request.prompt, request.target_model)
+    try:
+        first = await anext(stream, "")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def text():
+        yield first
+        async for piece in stream:
+            yield piece
+
+    return StreamingResponse(text(), media_type="text/plain")
+
 
 @app.get("/")
 async def index(request: Request):
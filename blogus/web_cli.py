@@ -13,14 +13,25 @@ def main():
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
     try:
-        from blogus.web import app
+        import blogus.web  # noqa: F401
         import uvicorn
     except ImportError as e:
         print(f"Error importing web modules: {e}")
         print("Please install with web extras: pip install blogus[web]")
         sys.exit(1)
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # The app is passed as an import string so that uvicorn can start several worker
+    # processes. uvicorn uses uvloop and httptools automatically when they are installed
+    # (they come with the web extras via uvicorn[standard]).
+    limit_concurrency = os.getenv("BLOGUS_LIMIT_CONCURRENCY")
+    uvicorn.run(
+        "blogus.web:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("BLOGUS_WORKERS", "1")),
+        # Answer with 503 instead of queueing once this many connections are open
+        limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
+    )
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 Example usage of the Blogus library.
 """
 
-from blogus.core import LLMModel, analyze_prompt, generate_test
+from blogus.core import JudgeLLMModel, analyze_prompt, generate_test
 
 # Example prompt
 prompt = """
@@ -17,7 +17,7 @@ Please provide a concise and accurate answer.
 
 # Example usage of prompt analysis
 print("Analyzing prompt...")
-analysis = analyze_prompt(prompt, LLMModel.GPT_4)
+analysis = analyze_prompt(prompt, JudgeLLMModel.GPT_4)
 print(f"Overall goal alignment: {analysis.overall_goal_alignment}/10")
 print(f"Estimated effectiveness: {analysis.estimated_effectiveness}/10")
 print("Suggested improvements:")
@@ -26,7 +26,7 @@ for i, improvement in enumerate(analysis.suggested_improvements, 1):
 
 # Example usage of test generation
 print("\nGenerating test case...")
-test_case = generate_test(prompt, LLMModel.GPT_4)
+test_case = generate_test(prompt, JudgeLLMModel.GPT_4)
 print("Generated test case:")
 print(f"Input: {test_case.input}")
 print(f"Expected output: {test_case.expected_output}")
@@ -3,12 +3,14 @@
 Example: Cross-model comparison
 """
 
+import asyncio
+
 from blogus.core import (
-    execute_prompt,
+    aexecute_prompt,
     TargetLLMModel
 )
 
-def main():
+async def main():
     # Define a prompt to test
     prompt = "Explain the concept of photosynthesis in simple terms."
     
@@ -23,17 +25,21 @@ def main():
         TargetLLMModel.CLAUDE_3_HAIKU
     ]
     
-    # Execute prompt on each model
-    for model in models:
+    # Execute prompt on all models concurrently
+    responses = await asyncio.gather(
+        *[aexecute_prompt(prompt, model) for model in models],
+        return_exceptions=True
+    )
+    
+    for model, response in zip(models, responses):
         print(f"--- Response from {model.value} ---")
-        try:
-            response = execute_prompt(prompt, model)
+        if isinstance(response, Exception):
+            print(f"Error: {response}")
+        else:
             # Truncate long responses for display
             truncated_response = response[:300] + "..." if len(response) > 300 else response
             print(truncated_response)
-        except Exception as e:
-            print(f"Error: {e}")
         print()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
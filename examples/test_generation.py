@@ -4,12 +4,14 @@ Example: Test case generation for parameterized prompts
 """
 
 from blogus.core import (
-    generate_test,
+    agenerate_test,
+    ainfer_goal,
     JudgeLLMModel
 )
+import asyncio
 import json
 
-def main():
+async def main():
     # Define a parameterized prompt template
     prompt_template = "Translate the following {source_language} text to {target_language}: {text}"
     
@@ -21,10 +23,17 @@ def main():
     print("Generating test cases...")
     test_cases = []
     
-    for i in range(3):
-        print(f"Generating test case {i+1}...")
-        test_case = generate_test(prompt_template, JudgeLLMModel.GPT_4)
-        
+    # Infer the goal once and share it, rather than letting each call infer it
+    goal = await ainfer_goal(prompt_template, JudgeLLMModel.GPT_4)
+    
+    # Test generation is never cached, so each call asks the judge model for a
+    # new test case
+    generated = await asyncio.gather(
+        *[agenerate_test(prompt_template, JudgeLLMModel.GPT_4, goal) for _ in range(3)]
+    )
+    
+    for i, test_case in enumerate(generated):
+        print(f"Test case {i+1}:")
         test_cases.append({
             'id': i + 1,
             'input': test_case.input,
@@ -49,4 +58,4 @@ def main():
     print(f"Saved {len(test_cases)} test cases to translation_tests.json")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
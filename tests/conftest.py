@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the Blogus tests.
+"""
+
+import pytest
+
+# Don't collect the web tests at all when the web dependencies are not installed
+collect_ignore_glob = []
+try:
+    import fastapi  # noqa: F401
+except ImportError:
+    collect_ignore_glob.extend(["test_web.py", "test_web_functionality.py"])
+
+
+@pytest.fixture(scope="session")
+def web_module():
+    """The blogus.web module, imported once per test session.
+
+    Tests using it are skipped when the web dependencies are not installed.
+    """
+    return pytest.importorskip("blogus.web")
+
+
+@pytest.fixture(scope="session")
+def web_app(web_module):
+    """The FastAPI app, imported once per test session."""
+    return web_module.app
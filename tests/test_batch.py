@@ -0,0 +1,142 @@
+"""
+Tests for batch execution in Blogus.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from blogus.batch import generate_tests_batch, submit_batch
+from blogus.core import Test
+
+
+def make_output(contents):
+    """Build a batch output file holding one successful response per content."""
+    lines = [
+        json.dumps(
+            {
+                "custom_id": f"request-{i}",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": content}}]},
+                },
+            }
+        )
+        for i, content in enumerate(contents)
+    ]
+    # The batch API does not guarantee output order
+    return MagicMock(content="\n".join(reversed(lines)).encode("utf-8"))
+
+
+@patch("litellm.file_content")
+@patch("litellm.retrieve_batch")
+@patch("litellm.create_batch")
+@patch("litellm.create_file")
+def test_submit_batch(
+    mock_create_file, mock_create_batch, mock_retrieve_batch, mock_file_content
+):
+    """Test submit_batch uploads the requests, polls and returns ordered responses."""
+    mock_create_file.return_value = MagicMock(id="file-in")
+    mock_create_batch.return_value = MagicMock(id="batch-1", status="validating")
+    mock_retrieve_batch.return_value = MagicMock(
+        id="batch-1", status="completed", output_file_id="file-out", error_file_id=None
+    )
+    mock_file_content.return_value = make_output(["First", "Second"])
+
+    responses = submit_batch(
+        ["One", "Two"], "gpt-4o", system="Instructions", poll_interval=0
+    )
+    assert responses == ["First", "Second"]
+
+    _, payload = mock_create_file.call_args.kwargs["file"]
+    requests = [json.loads(line) for line in payload.decode("utf-8").splitlines()]
+    assert [r["custom_id"] for r in requests] == ["request-0", "request-1"]
+    assert requests[0]["body"]["messages"][0] == {"role": "system", "content": "Instructions"}
+    assert requests[1]["body"]["messages"][1] == {"role": "user", "content": "Two"}
+
+
+@patch("litellm.retrieve_batch")
+@patch("litellm.create_batch")
+@patch("litellm.create_file")
+def test_submit_batch_failed(mock_create_file, mock_create_batch, mock_retrieve_batch):
+    """Test submit_batch raises when the batch does not complete."""
+    mock_create_batch.return_value = MagicMock(id="batch-1", status="failed")
+    with pytest.raises(RuntimeError):
+        submit_batch(["One"], "gpt-4o", poll_interval=0)
+    mock_retrieve_batch.assert_not_called()
+
+
+@pytest.mark.parametrize("output_file_id", ["file-out", None])
+@patch("litellm.file_content")
+@patch("litellm.retrieve_batch")
+@patch("litellm.create_batch")
+@patch("litellm.create_file")
+def test_submit_batch_request_errors(
+    mock_create_file,
+    mock_create_batch,
+    mock_retrieve_batch,
+    mock_file_content,
+    output_file_id,
+):
+    """Test submit_batch raises RuntimeError naming the requests in the error file."""
+    error = {
+        "custom_id": "request-1",
+        "response": {"status_code": 400, "body": {"error": {"message": "Bad request"}}},
+    }
+    files = {
+        "file-out": make_output(["First"]),
+        "file-err": MagicMock(content=json.dumps(error).encode("utf-8")),
+    }
+    mock_file_content.side_effect = lambda file_id, **kwargs: files[file_id]
+    mock_create_file.return_value = MagicMock(id="file-in")
+    mock_create_batch.return_value = MagicMock(
+        id="batch-1",
+        status="completed",
+        output_file_id=output_file_id,
+        error_file_id="file-err",
+    )
+
+    with pytest.raises(RuntimeError, match="request-1.*Bad request"):
+        submit_batch(["One", "Two"], "gpt-4o", poll_interval=0)
+
+
+@patch("litellm.file_content")
+@patch("litellm.create_batch")
+@patch("litellm.create_file")
+def test_submit_batch_missing_response(
+    mock_create_file, mock_create_batch, mock_file_content
+):
+    """Test submit_batch raises RuntimeError when a request has no result at all."""
+    mock_create_file.return_value = MagicMock(id="file-in")
+    mock_create_batch.return_value = MagicMock(
+        id="batch-1", status="completed", output_file_id="file-out", error_file_id=None
+    )
+    mock_file_content.return_value = make_output(["First"])
+
+    with pytest.raises(RuntimeError, match="no response for request-1"):
+        submit_batch(["One", "Two"], "gpt-4o", poll_interval=0)
+
+
+def test_submit_batch_requires_openai():
+    """Test submit_batch rejects models from other providers."""
+    with pytest.raises(ValueError):
+        submit_batch(["One"], "claude-3-opus-20240229")
+
+
+@patch("blogus.batch.submit_batch")
+def test_generate_tests_batch(mock_submit_batch):
+    """Test generate_tests_batch submits n requests and parses each test case."""
+    mock_submit_batch.return_value = [
+        '{"input": {"text": "Hello"}, "expected_output": "Bonjour", "goal_relevance": 5}',
+        '{"input": {"text": "Thanks"}, "expected_output": "Merci", "goal_relevance": 4}',
+    ]
+
+    tests = generate_tests_batch(
+        "Translate to French: {text}", "gpt-4o", 2, goal="Translate text"
+    )
+    assert [t.expected_output for t in tests] == ["Bonjour", "Merci"]
+    assert all(isinstance(t, Test) for t in tests)
+    prompts = mock_submit_batch.call_args.args[0]
+    assert len(prompts) == 2 and prompts[0] != prompts[1]
+    assert mock_submit_batch.call_args.kwargs["json_mode"] is True
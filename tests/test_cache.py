@@ -0,0 +1,74 @@
+"""
+Tests for the exact-match response cache of Blogus.
+"""
+
+from blogus.cache import FileBackend, LLMCache, MemoryBackend
+
+
+def test_make_key_is_stable():
+    """Test that keys depend on the request fields, not their order."""
+    key = LLMCache.make_key(model="gpt-4o", prompt="Hello", max_tokens=1000)
+    assert key == LLMCache.make_key(max_tokens=1000, prompt="Hello", model="gpt-4o")
+    assert key != LLMCache.make_key(model="gpt-4o", prompt="Hello", max_tokens=500)
+
+
+def test_llm_cache_hits_and_misses():
+    """Test that lookups are counted as hits or misses."""
+    cache = LLMCache()
+    assert cache.get("key") is None
+    cache.set("key", "Response")
+    assert cache.get("key") == "Response"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_llm_cache_ttl(monkeypatch):
+    """Test that entries expire after the TTL."""
+    now = [1000.0]
+    monkeypatch.setattr("blogus.cache.time.time", lambda: now[0])
+
+    cache = LLMCache(ttl=60)
+    cache.set("key", "Response")
+    now[0] += 30
+    assert cache.get("key") == "Response"
+    now[0] += 60
+    assert cache.get("key") is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Test that the memory backend drops the least recently used entry."""
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", (0.0, "A"))
+    backend.set("b", (0.0, "B"))
+    backend.get("a")
+    backend.set("c", (0.0, "C"))
+    assert backend.get("b") is None
+    assert backend.get("a") == (0.0, "A")
+    assert len(backend) == 2
+
+
+def test_file_backend_persists(tmp_path):
+    """Test that the file backend shares entries between instances."""
+    LLMCache(FileBackend(str(tmp_path))).set("key", "Response")
+    assert LLMCache(FileBackend(str(tmp_path))).get("key") == "Response"
+
+    FileBackend(str(tmp_path)).clear()
+    assert LLMCache(FileBackend(str(tmp_path))).get("key") is None
+
+
+def test_from_env(monkeypatch, tmp_path):
+    """Test that the cache is configured from the environment."""
+    monkeypatch.setenv("BLOGUS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("BLOGUS_CACHE_TTL", "3600")
+    cache = LLMCache.from_env()
+    assert isinstance(cache.backend, FileBackend)
+    assert cache.ttl == 3600
+
+    monkeypatch.delenv("BLOGUS_CACHE_DIR")
+    monkeypatch.delenv("BLOGUS_CACHE_TTL")
+    cache = LLMCache.from_env()
+    assert isinstance(cache.backend, MemoryBackend)
+    assert cache.ttl is None
@@ -2,6 +2,9 @@
 Tests for the CLI interface of Blogus.
 """
 
+import subprocess
+import sys
+
 import pytest
 from click.testing import CliRunner
 from blogus.cli import cli
@@ -23,6 +26,16 @@ def test_cli_help(runner):
     )
 
 
+def test_cli_import_is_lazy():
+    """Test that importing the CLI does not load the core module or LiteLLM."""
+    code = (
+        "import sys, blogus.cli; "
+        "assert 'blogus.core' not in sys.modules; "
+        "assert 'litellm' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 def test_cli_analyze_command(runner):
     """Test the analyze command."""
     result = runner.invoke(cli, ["analyze", "--model", "gpt-3.5-turbo", "Test prompt"])
@@ -2,8 +2,12 @@
 Tests for the core functionality of Blogus.
 """
 
+import asyncio
+import subprocess
+import sys
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from blogus.core import (
     TargetLLMModel,
     JudgeLLMModel,
@@ -18,6 +22,18 @@ from blogus.core import (
     analyze_prompt,
     generate_test,
     execute_prompt,
+    FullAnalysis,
+    aget_llm_response,
+    aanalyze_fragments,
+    aanalyze_fragments_stream,
+    full_analysis,
+    PromptSession,
+    get_llm_responses,
+    analyze_all,
+    execute_prompt_stream,
+    aexecute_prompt,
+    analyze_combined,
+    aexecute_prompt_stream,
 )
 
 # Test data
@@ -25,6 +41,14 @@ SAMPLE_PROMPT = "You are an AI assistant that helps people find information."
 SAMPLE_GOAL = "Help users find information"
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Start every test with an empty LLM response cache."""
+    get_llm_response.cache_clear()
+    yield
+    get_llm_response.cache_clear()
+
+
 @pytest.fixture
 def mock_llm_response():
     """Mock LLM response for testing."""
@@ -99,7 +123,7 @@ def test_prompt_analysis_creation():
     assert analysis.is_goal_inferred == True
 
 
-@patch("logus.core.completion")
+@patch("blogus.core.completion")
 def test_get_llm_response(mock_completion):
     """Test get_llm_response with Claude model."""
     mock_choice = MagicMock()
@@ -112,7 +136,179 @@ def test_get_llm_response(mock_completion):
     assert result == "Test response"
 
 
-@patch("logus.core.get_llm_response")
+@patch("blogus.core.load_dotenv")
+@patch("blogus.core.completion")
+def test_get_llm_response_loads_env_once(mock_completion, mock_load_dotenv):
+    """Test that .env is loaded lazily on the first LLM call only."""
+    from blogus.core import _ensure_env
+
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Response"
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+
+    _ensure_env.cache_clear()
+    get_llm_response("gpt-4o", "First prompt")
+    get_llm_response("gpt-4o", "Second prompt")
+    assert mock_load_dotenv.call_count == 1
+
+
+def test_core_import_is_lazy():
+    """Test that importing the core module does not load LiteLLM or faiss."""
+    code = (
+        "import sys, blogus.core; "
+        "assert 'litellm' not in sys.modules and 'faiss' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_http_client_is_pooled():
+    """Test that LiteLLM shares one persistent HTTP client."""
+    import httpx
+    from blogus.core import _litellm
+
+    litellm = _litellm()
+    assert isinstance(litellm.client_session, httpx.Client)
+    assert not litellm.client_session.is_closed
+
+
+@patch("blogus.core.completion")
+def test_get_llm_response_cache(mock_completion):
+    """Test that identical requests are served from the response cache."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Cached response"
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+
+    first = get_llm_response("gpt-4o", "Test prompt")
+    second = get_llm_response("gpt-4o", "Test prompt")
+    assert first == second == "Cached response"
+    assert mock_completion.call_count == 1
+
+    get_llm_response("gpt-4o", "Test prompt", max_tokens=500)
+    assert mock_completion.call_count == 2
+
+    get_llm_response("gpt-4o", "Test prompt", no_cache=True)
+    assert mock_completion.call_count == 3
+
+    get_llm_response.cache_clear()
+    get_llm_response("gpt-4o", "Test prompt")
+    assert mock_completion.call_count == 4
+
+
+@patch("blogus.core.completion")
+def test_get_llm_response_json_mode(mock_completion):
+    """Test that json_mode requests a JSON object response format."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = '{"goal": "Test"}'
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+
+    get_llm_response("gpt-4o", "Test prompt", json_mode=True)
+    assert mock_completion.call_args.kwargs["response_format"] == {
+        "type": "json_object"
+    }
+
+    get_llm_response("gpt-4o", "Test prompt")
+    assert "response_format" not in mock_completion.call_args.kwargs
+    assert mock_completion.call_count == 2
+
+
+@patch("blogus.core.completion")
+def test_get_llm_response_schema(mock_completion):
+    """Test that a JSON schema is requested only from models that support it."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = '{"goal": "Test"}'
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+    schema = {"name": "goal", "schema": {"type": "object"}}
+
+    get_llm_response("gpt-4o", "Test prompt", json_mode=True, schema=schema)
+    assert mock_completion.call_args.kwargs["response_format"] == {
+        "type": "json_schema",
+        "json_schema": schema,
+    }
+
+    get_llm_response("gpt-3.5-turbo", "Test prompt", json_mode=True, schema=schema)
+    assert mock_completion.call_args.kwargs["response_format"] == {
+        "type": "json_object"
+    }
+
+
+def test_strict_schemas():
+    """Test that strict response schemas follow the rules of strict structured outputs."""
+    from blogus import core
+
+    def check(node):
+        if isinstance(node, dict):
+            if node.get("type") == "object":
+                assert node["additionalProperties"] is False
+                assert set(node["required"]) == set(node["properties"])
+            for value in node.values():
+                check(value)
+
+    schemas = [getattr(core, name) for name in dir(core) if name.endswith("_SCHEMA")]
+    strict = [schema for schema in schemas if schema.get("strict")]
+    assert core._FRAGMENTS_SCHEMA in strict
+    for schema in strict:
+        check(schema["schema"])
+
+
+@patch("blogus.core.completion")
+def test_get_llm_response_system(mock_completion):
+    """Test that system instructions are sent first and marked cacheable."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Response"
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+
+    get_llm_response("gpt-4o", "Test prompt", system="Instructions")
+    system_message, user_message = mock_completion.call_args.kwargs["messages"]
+    assert system_message["role"] == "system"
+    assert system_message["content"][0]["text"] == "Instructions"
+    assert system_message["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert user_message == {"role": "user", "content": "Test prompt"}
+
+    # Different system instructions must not share a cached response
+    get_llm_response("gpt-4o", "Test prompt", system="Other instructions")
+    assert mock_completion.call_count == 2
+
+
+@patch("blogus.core.batch_completion")
+def test_get_llm_responses(mock_batch_completion):
+    """Test get_llm_responses batches only the uncached prompts."""
+    def make_response(content):
+        choice = MagicMock()
+        choice.message.content = content
+        return MagicMock(choices=[choice])
+
+    mock_batch_completion.return_value = [
+        make_response("First"),
+        make_response("Second"),
+    ]
+
+    assert get_llm_responses("gpt-4o", ["One", "Two"]) == ["First", "Second"]
+    assert len(mock_batch_completion.call_args.kwargs["messages"]) == 2
+
+    mock_batch_completion.return_value = [make_response("Third")]
+    assert get_llm_responses("gpt-4o", ["One", "Three"]) == ["First", "Third"]
+    assert mock_batch_completion.call_args.kwargs["messages"] == [
+        [{"role": "user", "content": "Three"}]
+    ]
+
+    # Prompts flagged no_cache are always sent and their responses are not stored
+    mock_batch_completion.return_value = [make_response("Fourth"), make_response("Fifth")]
+    assert get_llm_responses(
+        "gpt-4o", ["One", "Two", "Four"], no_cache=[True, False, True]
+    ) == ["Fourth", "Second", "Fifth"]
+    assert get_llm_responses("gpt-4o", ["One"]) == ["First"]
+
+
+@patch("blogus.core.batch_completion")
+def test_get_llm_responses_error(mock_batch_completion):
+    """Test get_llm_responses raises errors returned by the batch."""
+    mock_batch_completion.return_value = [RuntimeError("rate limited")]
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        get_llm_responses("gpt-4o", ["One"])
+
+
+@patch("blogus.core.get_llm_response")
 def test_infer_goal(mock_get_llm_response):
     """Test infer_goal function."""
     mock_get_llm_response.return_value = '{"goal": "Help users find information"}'
@@ -121,7 +317,41 @@ def test_infer_goal(mock_get_llm_response):
     assert result == "Help users find information"
 
 
-@patch("logus.core.get_llm_response")
+@pytest.mark.parametrize(
+    "prompt, goal",
+    [
+        ("Goal: Summarize support tickets\nTicket: {ticket}", "Summarize support tickets"),
+        ("Your goal is to translate English to French.", "Translate English to French"),
+    ],
+)
+@patch("blogus.core.get_llm_response")
+def test_infer_goal_explicit(mock_get_llm_response, prompt, goal):
+    """Test that an explicitly stated goal is returned without calling the judge."""
+    assert infer_goal(prompt, "gpt-4o") == goal
+    mock_get_llm_response.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "Purpose-built assistant for tax questions.",
+        "Objective-C expert who reviews iOS code.",
+        "Goal: {goal}\nAnswer the question: {question}",
+        "Rate the answer.\nGoal: 4/5",
+        "Goal:none",
+        "Your task is complete when the user says thanks.",
+    ],
+)
+@patch("blogus.core.get_llm_response")
+def test_infer_goal_no_explicit_goal(mock_get_llm_response, prompt):
+    """Test that text that only looks like a goal statement is sent to the judge."""
+    mock_get_llm_response.return_value = '{"goal": "Inferred goal"}'
+
+    assert infer_goal(prompt, "gpt-4o") == "Inferred goal"
+    mock_get_llm_response.assert_called_once()
+
+
+@patch("blogus.core.get_llm_response")
 def test_analyze_fragments(mock_get_llm_response):
     """Test analyze_fragments function."""
     mock_get_llm_response.return_value = '{"fragments": [{"text": "Sample text", "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}]}'
@@ -131,7 +361,51 @@ def test_analyze_fragments(mock_get_llm_response):
     assert isinstance(fragments[0], Fragment)
 
 
-@patch("logus.core.get_llm_response")
+@patch("blogus.core.get_llm_response")
+def test_analyze_fragments_invalid_json(mock_get_llm_response):
+    """Test analyze_fragments raises ValueError on an unparseable response."""
+    mock_get_llm_response.return_value = "Sorry, I cannot help with that."
+
+    with pytest.raises(ValueError, match="Failed to parse fragment analysis"):
+        analyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)
+
+
+@patch("blogus.core.completion")
+def test_analyze_fragments_invalid_json_not_cached(mock_completion):
+    """Test that an unparseable response is dropped from the cache, so a retry calls the model."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = '{"fragments": [{"text": "truncat'
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            analyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)
+    assert mock_completion.call_count == 3
+
+    mock_choice.message.content = '{"fragments": []}'
+    assert analyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL) == []
+    assert analyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL) == []
+    assert mock_completion.call_count == 4
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '```json\n{"fragments": []}\n```',
+        'Here is the analysis:\n{"fragments": []}\nLet me know if you need more.',
+        '{"fragments": [{"text": "Use {braces} and \\"quotes\\"", "type": "instruction", "goal_alignment": 4, "improvement_suggestion": "}"}]} Done.',
+    ],
+)
+@patch("blogus.core.get_llm_response")
+def test_analyze_fragments_wrapped_json(mock_get_llm_response, response):
+    """Test that JSON wrapped in code fences or prose is still parsed."""
+    mock_get_llm_response.return_value = response
+
+    fragments = analyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)
+    assert all(isinstance(f, Fragment) for f in fragments)
+
+
+@patch("blogus.core.get_llm_response")
 def test_analyze_logs(mock_get_llm_response):
     """Test analyze_logs function."""
     mock_get_llm_response.return_value = (
@@ -143,7 +417,7 @@ def test_analyze_logs(mock_get_llm_response):
     assert isinstance(logs[0], Log)
 
 
-@patch("logus.core.get_llm_response")
+@patch("blogus.core.get_llm_response")
 def test_analyze_prompt(mock_get_llm_response):
     """Test analyze_prompt function."""
     mock_get_llm_response.return_value = '{"overall_goal_alignment": 8, "suggested_improvements": ["Add more context"], "estimated_effectiveness": 7, "inferred_goal": "", "is_goal_inferred": false}'
@@ -153,7 +427,7 @@ def test_analyze_prompt(mock_get_llm_response):
     assert analysis.overall_goal_alignment == 8
 
 
-@patch("logus.core.get_llm_response")
+@patch("blogus.core.get_llm_response")
 def test_generate_test(mock_get_llm_response):
     """Test generate_test function."""
     mock_get_llm_response.return_value = '{"input": {"question": "What is AI?"}, "expected_output": "AI is artificial intelligence", "goal_relevance": 5}'
@@ -163,10 +437,467 @@ def test_generate_test(mock_get_llm_response):
     assert test_case.input == {"question": "What is AI?"}
 
 
-@patch("logus.core.get_llm_response")
+@patch("blogus.core.completion")
+def test_generate_test_not_cached(mock_completion):
+    """Test that every generate_test call asks the model for a new test case."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = '{"input": {}, "expected_output": "", "goal_relevance": 4}'
+    mock_completion.return_value = MagicMock(choices=[mock_choice])
+
+    generate_test(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)
+    generate_test(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)
+    assert mock_completion.call_count == 2
+
+
+@patch("blogus.core.get_llm_response")
+def test_generate_test_lists_variables_once(mock_get_llm_response):
+    """Test that repeated template variables are listed once, in order."""
+    mock_get_llm_response.return_value = '{"input": {}, "expected_output": "", "goal_relevance": 4}'
+
+    generate_test("Compare {a} with {b}, then {a} again.", "gpt-4o", SAMPLE_GOAL)
+    assert mock_get_llm_response.call_args.args[1].endswith(
+        "Variables found in the prompt: a, b"
+    )
+
+
+@patch("blogus.core.get_llm_response")
+def test_generate_test_static_prompt(mock_get_llm_response):
+    """Test generate_test skips the judge model for prompts without variables."""
+    mock_get_llm_response.return_value = "Target output"
+
+    test_case = generate_test(SAMPLE_PROMPT, "gpt-4o", target_model="gpt-3.5-turbo")
+    assert test_case.input == {}
+    assert test_case.expected_output == "Target output"
+    mock_get_llm_response.assert_called_once_with("gpt-3.5-turbo", SAMPLE_PROMPT)
+
+
+@patch("blogus.core.get_llm_response")
 def test_execute_prompt(mock_get_llm_response):
     """Test execute_prompt function."""
     mock_get_llm_response.return_value = "This is a test response"
 
     result = execute_prompt(SAMPLE_PROMPT, "gpt-4o")
     assert result == "This is a test response"
+
+
+@patch("blogus.core.get_llm_response")
+def test_prompt_session(mock_get_llm_response):
+    """Test that a PromptSession infers the goal once for every analysis."""
+    mock_get_llm_response.side_effect = [
+        '{"goal": "Help users find information"}',
+        '{"logs": [{"type": "info", "message": "Test log message"}]}',
+        '{"overall_goal_alignment": 8, "suggested_improvements": [], "estimated_effectiveness": 7, "inferred_goal": "Help users find information", "is_goal_inferred": true}',
+    ]
+
+    session = PromptSession(SAMPLE_PROMPT, "gpt-4o")
+    assert session.goal == SAMPLE_GOAL
+    assert len(session.logs()) == 1
+    assert session.analyze().is_goal_inferred
+    assert mock_get_llm_response.call_count == 3
+    for call in mock_get_llm_response.call_args_list[1:]:
+        assert SAMPLE_GOAL in call.args[1]
+
+
+@patch("blogus.core.acompletion", new_callable=AsyncMock)
+def test_aget_llm_response(mock_acompletion):
+    """Test aget_llm_response shares the response cache."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Async response"
+    mock_acompletion.return_value = MagicMock(choices=[mock_choice])
+
+    assert asyncio.run(aget_llm_response("gpt-4o", "Test prompt")) == "Async response"
+    assert get_llm_response("gpt-4o", "Test prompt") == "Async response"
+    assert mock_acompletion.await_count == 1
+
+
+@patch("blogus.core.acompletion", new_callable=AsyncMock)
+def test_aget_llm_response_coalesces_concurrent_requests(mock_acompletion):
+    """Test that identical concurrent requests share a single model call."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Shared response"
+
+    async def slow_completion(**kwargs):
+        await asyncio.sleep(0.01)
+        return MagicMock(choices=[mock_choice])
+
+    mock_acompletion.side_effect = slow_completion
+
+    async def run():
+        return await asyncio.gather(
+            *[aget_llm_response("gpt-4o", "Concurrent prompt") for _ in range(3)]
+        )
+
+    assert asyncio.run(run()) == ["Shared response"] * 3
+    assert mock_acompletion.await_count == 1
+
+
+@patch("blogus.core.acompletion", new_callable=AsyncMock)
+def test_aget_llm_response_leader_cancelled(mock_acompletion):
+    """Test that cancelling the first of several identical requests does not cancel the rest."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Shared response"
+
+    async def slow_completion(**kwargs):
+        await asyncio.sleep(0.01)
+        return MagicMock(choices=[mock_choice])
+
+    mock_acompletion.side_effect = slow_completion
+
+    async def run():
+        leader = asyncio.create_task(aget_llm_response("gpt-4o", "Concurrent prompt"))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(aget_llm_response("gpt-4o", "Concurrent prompt"))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == ["Shared response"] * 2
+    assert mock_acompletion.await_count == 1
+
+
+def test_completion_retries(monkeypatch):
+    """Test that LLM calls retry transient errors as configured by the environment."""
+    from blogus import core
+
+    litellm = core._litellm()
+    mock_completion = MagicMock()
+    monkeypatch.setattr(litellm, "completion", mock_completion)
+
+    monkeypatch.setenv("BLOGUS_NUM_RETRIES", "5")
+    core._retry_options.cache_clear()
+    core.completion(model="gpt-4o", messages=[])
+    assert mock_completion.call_args.kwargs["num_retries"] == 5
+
+    monkeypatch.setenv("BLOGUS_NUM_RETRIES", "0")
+    core._retry_options.cache_clear()
+    core.completion(model="gpt-4o", messages=[])
+    assert "num_retries" not in mock_completion.call_args.kwargs
+    core._retry_options.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "error, retries",
+    [
+        ("RateLimitError", 3),
+        ("Timeout", 3),
+        ("InternalServerError", 3),
+        ("APIConnectionError", 3),
+        ("AuthenticationError", 0),
+        ("BadRequestError", 0),
+        ("ContextWindowExceededError", 0),
+        ("NotFoundError", 0),
+    ],
+)
+def test_completion_retries_transient_errors_only(monkeypatch, error, retries):
+    """Test that the retry policy only retries errors that may succeed on retry."""
+    from blogus import core
+    from litellm.utils import get_num_retries_from_retry_policy
+
+    litellm = core._litellm()
+    monkeypatch.delenv("BLOGUS_NUM_RETRIES", raising=False)
+    core._retry_options.cache_clear()
+    exception = getattr(litellm, error)(
+        message="Error", llm_provider="openai", model="gpt-4o"
+    )
+    policy = core._retry_options()["retry_policy"]
+    assert get_num_retries_from_retry_policy(exception, policy) == retries
+    core._retry_options.cache_clear()
+
+
+def test_acompletion_rate_limit(monkeypatch):
+    """Test that BLOGUS_RATE_LIMIT spaces out async requests to each model."""
+    import time
+    from blogus import core
+
+    litellm = core._litellm()
+    monkeypatch.setattr(litellm, "acompletion", AsyncMock(return_value="Response"))
+    monkeypatch.setattr(core, "_rate_limiters", {})
+    monkeypatch.setenv("BLOGUS_RATE_LIMIT", "20")
+    core._rate_limit.cache_clear()
+
+    async def timed(model):
+        await core.acompletion(model=model, messages=[])
+        return time.monotonic()
+
+    async def run():
+        start = time.monotonic()
+        finished = await asyncio.gather(
+            timed("gpt-4o"), timed("gpt-4o"), timed("gpt-4o"), timed("gpt-3.5-turbo")
+        )
+        return [end - start for end in finished]
+
+    try:
+        elapsed = asyncio.run(run())
+    finally:
+        core._rate_limit.cache_clear()
+
+    # Requests to one model start 50ms apart; other models are not held up
+    assert elapsed[2] >= 0.09
+    assert elapsed[3] < 0.05
+
+
+def test_async_http_client_per_event_loop(monkeypatch):
+    """Test that async LLM calls share a pooled client within an event loop."""
+    import httpx
+    from blogus import core
+
+    litellm = core._litellm()
+    monkeypatch.setattr(litellm, "aclient_session", None)
+    monkeypatch.setattr(core, "_async_client_loop", None)
+    monkeypatch.setattr(litellm, "acompletion", AsyncMock(return_value="Response"))
+
+    async def run():
+        await core.acompletion(model="gpt-4o", messages=[])
+        client = litellm.aclient_session
+        await core.acompletion(model="gpt-4o", messages=[])
+        assert litellm.aclient_session is client
+        return client
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+    assert isinstance(first, httpx.AsyncClient)
+    assert first is not second
+    # The client of the finished event loop is closed when it is replaced
+    assert first.is_closed
+    assert not second.is_closed
+
+
+def test_aclose_http_client(monkeypatch):
+    """Test that the pooled async client is closed and replaced on next use."""
+    from blogus import core
+
+    litellm = core._litellm()
+    monkeypatch.setattr(litellm, "aclient_session", None)
+    monkeypatch.setattr(core, "_async_client_loop", None)
+    monkeypatch.setattr(litellm, "acompletion", AsyncMock(return_value="Response"))
+
+    async def run():
+        await core.acompletion(model="gpt-4o", messages=[])
+        client = litellm.aclient_session
+        await core.aclose_http_client()
+        assert client.is_closed
+        assert litellm.aclient_session is None
+        await core.acompletion(model="gpt-4o", messages=[])
+        assert litellm.aclient_session is not client
+
+    asyncio.run(run())
+
+
+@patch("blogus.core.aget_llm_response", new_callable=AsyncMock)
+def test_aanalyze_fragments(mock_aget_llm_response):
+    """Test aanalyze_fragments function."""
+    mock_aget_llm_response.return_value = '{"fragments": [{"text": "Sample text", "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}]}'
+
+    fragments = asyncio.run(aanalyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL))
+    assert len(fragments) == 1
+    assert isinstance(fragments[0], Fragment)
+
+
+@patch("blogus.core.aget_llm_response", new_callable=AsyncMock)
+def test_aanalyze_fragments_parses_large_responses_in_thread(mock_aget_llm_response):
+    """Test that large judge responses are parsed off the event loop."""
+    import json
+
+    fragment = {"text": "Sample text " * 10, "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}
+    mock_aget_llm_response.return_value = json.dumps({"fragments": [fragment] * 50})
+
+    with patch("blogus.core.asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+        fragments = asyncio.run(aanalyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL))
+    assert len(fragments) == 50
+    mock_to_thread.assert_called_once()
+
+    mock_aget_llm_response.return_value = json.dumps({"fragments": [fragment]})
+    with patch("blogus.core.asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+        asyncio.run(aanalyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL))
+    mock_to_thread.assert_not_called()
+
+
+@patch("blogus.core.aget_llm_response", new_callable=AsyncMock)
+def test_aexecute_prompt(mock_aget_llm_response):
+    """Test aexecute_prompt runs prompts on several models concurrently."""
+    mock_aget_llm_response.side_effect = lambda model, prompt: f"{model}: {prompt}"
+
+    async def run():
+        return await asyncio.gather(
+            *[aexecute_prompt("Hello", model) for model in ("gpt-4o", "gpt-3.5-turbo")]
+        )
+
+    assert asyncio.run(run()) == ["gpt-4o: Hello", "gpt-3.5-turbo: Hello"]
+
+
+@patch("blogus.core.aget_llm_response", new_callable=AsyncMock)
+def test_full_analysis(mock_aget_llm_response):
+    """Test full_analysis infers the goal once and runs every analysis."""
+    responses = {
+        "infer the likely goal": '{"goal": "Help users find information"}',
+        "Divide the prompt into fragments": '{"fragments": [{"text": "Sample text", "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}]}',
+        "Generate a list of logs": '{"logs": [{"type": "info", "message": "Test log message"}]}',
+        "Provide an overall analysis": '{"overall_goal_alignment": 8, "suggested_improvements": ["Add more context"], "estimated_effectiveness": 7, "inferred_goal": "Help users find information", "is_goal_inferred": true}',
+        "Generate a test case": '{"input": {}, "expected_output": "Information", "goal_relevance": 4}',
+    }
+
+    async def respond(model, prompt, *args, **kwargs):
+        system = kwargs.get("system", "")
+        return next(r for marker, r in responses.items() if marker in system)
+
+    mock_aget_llm_response.side_effect = respond
+
+    result = asyncio.run(full_analysis(SAMPLE_PROMPT, "gpt-4o"))
+    assert isinstance(result, FullAnalysis)
+    assert result.goal == SAMPLE_GOAL
+    assert result.is_goal_inferred
+    assert len(result.fragments) == 1
+    assert len(result.logs) == 1
+    assert result.analysis.is_goal_inferred
+    assert result.test.goal_relevance == 4
+    assert mock_aget_llm_response.await_count == 5
+
+
+@patch("blogus.core.get_llm_responses")
+def test_analyze_all(mock_get_llm_responses):
+    """Test analyze_all sends the four analyses in one batch."""
+    mock_get_llm_responses.return_value = [
+        '{"fragments": []}',
+        '{"logs": [{"type": "info", "message": "Test log message"}]}',
+        '{"overall_goal_alignment": 8, "suggested_improvements": [], "estimated_effectiveness": 7, "inferred_goal": "", "is_goal_inferred": false}',
+        '{"input": {}, "expected_output": "Information", "goal_relevance": 4}',
+    ]
+
+    result = analyze_all(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)
+    assert isinstance(result, FullAnalysis)
+    assert not result.is_goal_inferred
+    assert result.fragments == []
+    assert len(result.logs) == 1
+    assert result.analysis.overall_goal_alignment == 8
+    assert result.test.goal_relevance == 4
+    assert mock_get_llm_responses.call_count == 1
+    assert mock_get_llm_responses.call_args.kwargs["no_cache"] == [False, False, False, True]
+
+
+@patch("blogus.core.completion")
+def test_execute_prompt_stream(mock_completion):
+    """Test execute_prompt_stream yields streamed text and caches the result."""
+    def make_chunk(content):
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = content
+        return chunk
+
+    mock_completion.return_value = iter(
+        [make_chunk("Hello"), make_chunk(None), make_chunk(" world")]
+    )
+
+    assert list(execute_prompt_stream(SAMPLE_PROMPT, "gpt-4o")) == ["Hello", " world"]
+    assert mock_completion.call_args.kwargs["stream"] is True
+    assert execute_prompt(SAMPLE_PROMPT, "gpt-4o") == "Hello world"
+    assert mock_completion.call_count == 1
+
+
+@patch("blogus.core.acompletion", new_callable=AsyncMock)
+def test_aexecute_prompt_stream(mock_acompletion):
+    """Test aexecute_prompt_stream yields streamed text asynchronously."""
+    async def stream():
+        for content in ("Hello", None, " world"):
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = content
+            yield chunk
+
+    mock_acompletion.return_value = stream()
+
+    async def collect():
+        return [text async for text in aexecute_prompt_stream(SAMPLE_PROMPT, "gpt-4o")]
+
+    assert asyncio.run(collect()) == ["Hello", " world"]
+    assert mock_acompletion.call_args.kwargs["stream"] is True
+
+
+@patch("blogus.core.acompletion", new_callable=AsyncMock)
+def test_aanalyze_fragments_stream(mock_acompletion):
+    """Test that fragments are yielded as soon as their JSON is complete."""
+    response = '{"fragments": [{"text": "Sample text", "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}, {"text": "Context", "type": "context", "goal_alignment": 3, "improvement_suggestion": "Be specific"}]}'
+    first_end = response.index("}") + 1
+    received = []
+
+    async def stream():
+        for content in (response[:20], response[20:first_end], response[first_end:]):
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = content
+            yield chunk
+            received.append(content)
+
+    mock_acompletion.return_value = stream()
+
+    async def collect():
+        fragments = []
+        async for fragment in aanalyze_fragments_stream(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL):
+            # The first fragment arrives before the rest of the response is read
+            fragments.append((fragment, len(received)))
+        return fragments
+
+    fragments = asyncio.run(collect())
+    assert [f.text for f, _ in fragments] == ["Sample text", "Context"]
+    assert fragments[0][1] == 1
+    assert mock_acompletion.call_args.kwargs["stream"] is True
+
+    # The full response is cached for the non-streaming analysis
+    cached = asyncio.run(aanalyze_fragments(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL))
+    assert [f.text for f in cached] == ["Sample text", "Context"]
+    assert mock_acompletion.await_count == 1
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '{"fragments": [{"text": "Sample text", "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}, {"text": "Cont',
+        '{"fragments": [{"text": "Sample text", "kind": "instruction"}]}',
+    ],
+)
+@patch("blogus.core.acompletion", new_callable=AsyncMock)
+def test_aanalyze_fragments_stream_invalid(mock_acompletion, response):
+    """Test that a truncated or malformed streamed analysis raises ValueError and is not cached."""
+    async def stream():
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = response
+        yield chunk
+
+    async def collect():
+        return [f async for f in aanalyze_fragments_stream(SAMPLE_PROMPT, "gpt-4o", SAMPLE_GOAL)]
+
+    for _ in range(2):
+        mock_acompletion.return_value = stream()
+        with pytest.raises(ValueError, match="Failed to parse fragment analysis"):
+            asyncio.run(collect())
+    assert mock_acompletion.await_count == 2
+
+
+@patch("blogus.core.get_llm_response")
+def test_analyze_combined(mock_get_llm_response):
+    """Test analyze_combined runs every analysis in one judge call."""
+    mock_get_llm_response.return_value = """{
+        "goal": "Help users find information",
+        "fragments": [{"text": "Sample text", "type": "instruction", "goal_alignment": 5, "improvement_suggestion": "Improve clarity"}],
+        "logs": [{"type": "info", "message": "Test log message"}],
+        "overall_goal_alignment": 8,
+        "suggested_improvements": ["Add more context"],
+        "estimated_effectiveness": 7,
+        "test": {"input": {}, "expected_output": "Information", "goal_relevance": 4}
+    }"""
+
+    result = analyze_combined(SAMPLE_PROMPT, "gpt-4o")
+    assert isinstance(result, FullAnalysis)
+    assert result.goal == SAMPLE_GOAL
+    assert result.is_goal_inferred
+    assert result.analysis.inferred_goal == SAMPLE_GOAL
+    assert len(result.fragments) == 1
+    assert len(result.logs) == 1
+    assert result.test.goal_relevance == 4
+    assert mock_get_llm_response.call_count == 1
+
+    result = analyze_combined(SAMPLE_PROMPT, "gpt-4o", goal="Provided goal")
+    assert result.goal == "Provided goal"
+    assert not result.is_goal_inferred
+    assert "Provided Goal: Provided goal" in mock_get_llm_response.call_args.args[1]
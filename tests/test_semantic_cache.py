@@ -0,0 +1,73 @@
+"""
+Tests for the semantic response cache of Blogus.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from blogus.semantic_cache import SemanticCache
+
+VOCABULARY = ["help", "find", "books", "book", "discovery", "weather", "today"]
+
+
+def fake_embed(text):
+    """Embed text as a bag of known words."""
+    words = text.lower().replace(".", "").split()
+    return [float(words.count(word)) for word in VOCABULARY]
+
+
+@pytest.fixture
+def cache():
+    """Create a semantic cache with a deterministic embedding function."""
+    return SemanticCache(threshold=0.8, embed=fake_embed)
+
+
+def test_semantic_cache_hit(cache):
+    """Test that a similar prompt reuses the cached response."""
+    cache.add("gpt-4o", "help find books", "Book finder")
+    assert cache.get("gpt-4o", "Help find books.") == "Book finder"
+    assert len(cache) == 1
+
+
+def test_semantic_cache_miss(cache):
+    """Test that dissimilar prompts and other namespaces miss."""
+    cache.add("gpt-4o", "help find books", "Book finder")
+    assert cache.get("gpt-4o", "weather today") is None
+    assert cache.get("claude-3-opus-20240229", "help find books") is None
+
+
+def test_semantic_cache_clear(cache):
+    """Test that clearing the cache removes all entries."""
+    cache.add("gpt-4o", "help find books", "Book finder")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("gpt-4o", "help find books") is None
+
+
+def test_semantic_cache_discard(cache):
+    """Test that discarding a response removes only the entries that store it."""
+    cache.add("gpt-4o", "help find books", "Book finder")
+    cache.add("gpt-4o", "weather today", "Forecast")
+    cache.add("claude-3-opus-20240229", "help find books", "Book finder")
+
+    cache.discard("gpt-4o", "Book finder")
+    assert cache.get("gpt-4o", "help find books") is None
+    assert cache.get("gpt-4o", "weather today") == "Forecast"
+    assert cache.get("claude-3-opus-20240229", "help find books") == "Book finder"
+
+    cache.discard("gpt-4o", "Forecast")
+    assert len(cache) == 1
+    assert cache.get("gpt-4o", "weather today") is None
+
+
+def test_semantic_cache_persistence(tmp_path):
+    """Test that saved entries are loaded by a new cache."""
+    path = str(tmp_path / "semantic_cache.json")
+    cache = SemanticCache(threshold=0.8, embed=fake_embed, path=path)
+    cache.add(("gpt-4o", 1000), "help find books", "Book finder")
+    cache.save()
+
+    reloaded = SemanticCache(threshold=0.8, embed=fake_embed, path=path)
+    assert len(reloaded) == 1
+    assert reloaded.get(("gpt-4o", 1000), "Help find books.") == "Book finder"
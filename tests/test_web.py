@@ -2,16 +2,239 @@
 Tests for the web interface of Blogus.
 """
 
+import importlib
+import json
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from fastapi.testclient import TestClient
+
+from blogus.core import Fragment, FullAnalysis, Log, PromptAnalysis, Test
+
+pytestmark = pytest.mark.web
 
 
-def test_web_import():
+@pytest.fixture
+def client(web_app):
+    """A test client for the web app, started with its lifespan."""
+    with TestClient(web_app) as client:
+        yield client
+
+
+def test_web_import(web_module):
     """Test that the web module can be imported without errors."""
-    try:
-        from blogus import web
-
-        assert web is not None
-    except ImportError as e:
-        # This is expected if web dependencies are not installed
-        # We just want to make sure it doesn't crash unexpectedly
-        assert "fastapi" in str(e) or "uvicorn" in str(e)
+    assert web_module.app is not None
+
+
+def test_analyze_prompt_endpoint(client):
+    """Test that the analyze-prompt endpoint returns the core analysis."""
+    analysis = PromptAnalysis(8, ["Add more context"], 7, "", False)
+    with patch(
+        "blogus.web.aanalyze_prompt", new_callable=AsyncMock, return_value=analysis
+    ) as mock_analyze:
+        response = client.post(
+            "/api/analyze-prompt",
+            json={
+                "prompt": "Answer questions.",
+                "target_model": "gpt-4o",
+                "judge_model": "gpt-4o",
+                "goal": "Help users",
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.json()["overall_goal_alignment"] == 8
+    mock_analyze.assert_awaited_once()
+
+
+def test_infer_goal_endpoint(client):
+    """Test that the infer-goal endpoint awaits the async core function."""
+    with patch(
+        "blogus.web.ainfer_goal", new_callable=AsyncMock, return_value=" Help users \n"
+    ) as mock_infer:
+        response = client.post(
+            "/api/infer-goal",
+            json={"prompt": "Answer questions.", "judge_model": "gpt-4o"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == "Help users"
+    mock_infer.assert_awaited_once()
+
+
+def test_analyze_all_endpoint(client):
+    """Test that the analyze-all endpoint returns every analysis in one response."""
+    result = FullAnalysis(
+        "Help users",
+        True,
+        [Fragment("Answer questions.", "instruction", 4, "Say which questions")],
+        [Log("info", "Prompt is short")],
+        PromptAnalysis(8, ["Add more context"], 7, "Help users", True),
+        Test({}, "An answer", 5),
+    )
+    with patch(
+        "blogus.web.full_analysis", new_callable=AsyncMock, return_value=result
+    ) as mock_analysis:
+        response = client.post(
+            "/api/analyze-all",
+            json={
+                "prompt": "Answer questions.",
+                "target_model": "gpt-4o",
+                "judge_model": "gpt-4o",
+            },
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["goal"] == "Help users"
+    assert data["fragments"][0]["goal_alignment"] == 4
+    assert data["logs"] == [{"type": "info", "message": "Prompt is short"}]
+    assert data["analysis"]["is_goal_inferred"] is True
+    assert data["test"]["expected_output"] == "An answer"
+    mock_analysis.assert_awaited_once()
+
+
+def test_generate_test_endpoint(client):
+    """Test that the generate-test endpoint passes the target model to the core."""
+    with patch(
+        "blogus.web.agenerate_test",
+        new_callable=AsyncMock,
+        return_value=Test({}, "An answer", 5),
+    ) as mock_generate:
+        response = client.post(
+            "/api/generate-test",
+            json={
+                "prompt": "Answer questions.",
+                "target_model": "gpt-3.5-turbo",
+                "judge_model": "gpt-4o",
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.json()["expected_output"] == "An answer"
+    assert mock_generate.call_args.args[3] == "gpt-3.5-turbo"
+
+
+def test_templates_compiled_on_startup(web_module, web_app):
+    """Test that the page templates are compiled when the app starts."""
+    with patch.object(web_module.templates, "get_template") as mock_get_template:
+        with TestClient(web_app):
+            pass
+
+    loaded = [call.args[0] for call in mock_get_template.call_args_list]
+    assert loaded == ["index.html", "agent.html"]
+    assert web_module.templates.env.auto_reload is False
+
+
+@pytest.mark.parametrize(
+    "value, auto_reload", [("1", True), ("true", True), ("0", False), ("false", False)]
+)
+def test_template_reload_setting(web_module, web_app, monkeypatch, value, auto_reload):
+    """Test that BLOGUS_TEMPLATE_RELOAD only enables reloading for a truthy value."""
+    monkeypatch.setenv("BLOGUS_TEMPLATE_RELOAD", value)
+    with TestClient(web_app):
+        assert web_module.templates.env.auto_reload is auto_reload
+
+
+def test_app_package_exports(web_app):
+    """Test that every name in the app compatibility package's __all__ exists."""
+    # The app package re-exports blogus.web, which web_app has already imported
+    app_package = importlib.import_module("app")
+    for name in app_package.__all__:
+        assert hasattr(app_package, name), name
+
+
+def test_execute_prompt_stream_endpoint(client):
+    """Test that the streaming endpoint sends the generated text."""
+    async def fake_stream(prompt, target_model):
+        for text in ("Hello", " world"):
+            yield text
+
+    with patch("blogus.web.aexecute_prompt_stream", fake_stream):
+        response = client.post(
+            "/api/execute-prompt/stream",
+            json={"prompt": "Say hello", "target_model": "gpt-4o"},
+        )
+
+    assert response.status_code == 200
+    assert response.text == "Hello world"
+
+
+def test_execute_prompt_stream_endpoint_error(client):
+    """Test that a provider error is reported as a 500 before streaming starts."""
+    async def failing_stream(prompt, target_model):
+        raise RuntimeError("Invalid API key")
+        yield
+
+    with patch("blogus.web.aexecute_prompt_stream", failing_stream):
+        response = client.post(
+            "/api/execute-prompt/stream",
+            json={"prompt": "Say hello", "target_model": "gpt-4o"},
+        )
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Invalid API key"
+
+
+def test_analyze_fragments_stream_endpoint(client):
+    """Test that the fragment streaming endpoint sends one JSON line per fragment."""
+    async def fake_stream(prompt, judge_model, goal):
+        yield Fragment("Answer questions.", "instruction", 4, "Say which questions")
+        yield Fragment("Be brief.", "constraint", 5, "None")
+
+    with patch("blogus.web.aanalyze_fragments_stream", fake_stream):
+        response = client.post(
+            "/api/analyze-fragments/stream",
+            json={
+                "prompt": "Answer questions. Be brief.",
+                "target_model": "gpt-4o",
+                "judge_model": "gpt-4o",
+                "goal": "Help users",
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["type"] for line in lines] == ["instruction", "constraint"]
+
+
+def test_analyze_fragments_stream_endpoint_error(client):
+    """Test that an error during fragment streaming ends the stream with an error line."""
+    async def failing_stream(prompt, judge_model, goal):
+        yield Fragment("Answer questions.", "instruction", 4, "Say which questions")
+        raise ValueError("Failed to parse fragment analysis")
+
+    with patch("blogus.web.aanalyze_fragments_stream", failing_stream):
+        response = client.post(
+            "/api/analyze-fragments/stream",
+            json={
+                "prompt": "Answer questions.",
+                "target_model": "gpt-4o",
+                "judge_model": "gpt-4o",
+                "goal": "Help users",
+            },
+        )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["type"] == "instruction"
+    assert lines[-1] == {"error": "Failed to parse fragment analysis"}
+
+
+def test_analyze_fragments_stream_endpoint_goal_error(client):
+    """Test that a failure to infer the goal is reported before streaming starts."""
+    with patch(
+        "blogus.web.ainfer_goal", AsyncMock(side_effect=RuntimeError("Rate limited"))
+    ):
+        response = client.post(
+            "/api/analyze-fragments/stream",
+            json={
+                "prompt": "Answer questions.",
+                "target_model": "gpt-4o",
+                "judge_model": "gpt-4o",
+            },
+        )
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Rate limited"
@@ -1,13 +0,0 @@
-"""
-Additional tests for the web interface functionality.
-"""
-import pytest
-
-def test_web_cli_import():
-    """Test that the web CLI module can be imported."""
-    try:
-        from blogus import web_cli
-        assert web_cli is not None
-    except ImportError as e:
-        # This is expected if web dependencies are not installed
-        assert "fastapi" in str(e) or "uvicorn" in str(e)
\ No newline at end of file
@@ -2,61 +2,52 @@
 """
 Test script to verify web interface functionality.
 """
-import sys
-import os
-
-# Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-def test_web_imports():
-    """Test that all web modules can be imported."""
-    try:
-        from blogus.web import app
-        print("✓ Web app imported successfully")
-        
-        # Test that all routes are defined
-        routes = [route.path for route in app.routes]
-        expected_routes = ["/", "/agent", "/api/infer-goal", "/api/analyze-fragments", 
-                          "/api/analyze-logs", "/api/analyze-prompt", "/api/generate-test", 
-                          "/api/execute-prompt"]
-        
-        for route in expected_routes:
-            if route in routes:
-                print(f"✓ Route {route} is defined")
-            else:
-                print(f"✗ Route {route} is missing")
-                
-        return True
-    except ImportError as e:
-        print(f"✗ Failed to import web modules: {e}")
-        return False
-    except Exception as e:
-        print(f"✗ Error testing web imports: {e}")
-        return False
-
-def test_web_cli_import():
-    """Test that the web CLI can be imported."""
-    try:
-        from blogus.web_cli import main
-        print("✓ Web CLI imported successfully")
-        return True
-    except ImportError as e:
-        print(f"✗ Failed to import web CLI: {e}")
-        return False
-    except Exception as e:
-        print(f"✗ Error testing web CLI import: {e}")
-        return False
-
-if __name__ == "__main__":
-    print("Testing web interface functionality...")
-    
-    success = True
-    success &= test_web_imports()
-    success &= test_web_cli_import()
-    
-    if success:
-        print("\n✓ All web interface tests passed!")
-        sys.exit(0)
-    else:
-        print("\n✗ Some web interface tests failed!")
-        sys.exit(1)
\ No newline at end of file
+import importlib
+from unittest.mock import patch
+
+import pytest
+
+from blogus.web_cli import main
+
+pytestmark = pytest.mark.web
+
+_EXPECTED_ROUTES = frozenset({
+    "/",
+    "/agent",
+    "/api/infer-goal",
+    "/api/analyze-fragments",
+    "/api/analyze-fragments/stream",
+    "/api/analyze-logs",
+    "/api/analyze-prompt",
+    "/api/analyze-all",
+    "/api/generate-test",
+    "/api/execute-prompt",
+    "/api/execute-prompt/stream",
+})
+
+
+def test_web_imports(web_app):
+    """Test that the web app can be imported and defines every route."""
+    missing = _EXPECTED_ROUTES - {route.path for route in web_app.routes}
+    assert not missing, f"missing routes: {missing}"
+
+
+@pytest.mark.parametrize("modname", ["blogus.web_cli", "app.main"])
+def test_web_cli_import(modname):
+    """Test that the web server entry point modules can be imported."""
+    module = importlib.import_module(modname)
+    assert module is not None
+
+
+def test_web_cli_main(monkeypatch):
+    """Test that the web CLI starts uvicorn with the configured server options."""
+    uvicorn = pytest.importorskip("uvicorn")
+
+    monkeypatch.setenv("BLOGUS_WORKERS", "4")
+    monkeypatch.setenv("BLOGUS_LIMIT_CONCURRENCY", "200")
+    with patch.object(uvicorn, "run") as mock_run:
+        main()
+
+    assert mock_run.call_args.args == ("blogus.web:app",)
+    assert mock_run.call_args.kwargs["workers"] == 4
+    assert mock_run.call_args.kwargs["limit_concurrency"] == 200